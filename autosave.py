@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+import argparse
+import contextlib
+import json
+import os
+import random
+import tempfile
+import time
+from typing import Dict, Optional
+
+from battle import Battle, TurnOrder
+from boss import Boss
+from core import Character
+from items import Item
+from simulation import CHARACTER_CLASSES
+from skills import Effect
+
+
+def _subclasses(base: type) -> Dict[str, type]:
+    found = {}
+    pending = [base]
+    while pending:
+        for cls in pending.pop().__subclasses__():
+            found[cls.__name__] = cls
+            pending.append(cls)
+    return found
+
+
+def _dump_objects(objects: list) -> list:
+    return [[obj.__class__.__name__, dict(obj.__dict__)] for obj in objects]
+
+
+def _load_objects(data: list, classes: Dict[str, type]) -> list:
+    objects = []
+    for class_name, attributes in data:
+        if class_name not in classes:
+            raise ValueError(f"Неизвестный тип в журнале: {class_name}")
+        obj = classes[class_name].__new__(classes[class_name])
+        obj.__dict__.update(attributes)
+        objects.append(obj)
+    return objects
+
+
+VITALS = ('hp', 'mp', 'damage_taken')
+DELTA_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+def _dump_cooldowns(char: Character) -> list:
+    return [skill.current_cooldown for skill in getattr(char, 'skills', [])]
+
+
+def unit_state(char: Character) -> dict:
+    state = {field: getattr(char, field) for field in VITALS}
+    state['effects'] = _dump_objects(char.get_effects())
+    state['cooldowns'] = _dump_cooldowns(char)
+    state['items'] = _dump_objects(char.inventory.items) if hasattr(char, 'inventory') else []
+    return state
+
+
+def _effect_ticks(effects: list, dumped: list) -> dict:
+    ticks = {}
+    for index, (effect, (_, attributes)) in enumerate(zip(effects, dumped)):
+        changed = {}
+        for field in effect.STATE_FIELDS:
+            value = getattr(effect, field)
+            if value != attributes[field]:
+                changed[field] = value
+        if changed:
+            ticks[str(index)] = changed
+    return ticks
+
+
+def unit_changes(char: Character, state: dict) -> dict:
+    changes = {}
+    for field in VITALS:
+        value = getattr(char, field)
+        if value != state[field]:
+            changes[field] = value
+
+    dirty = char.dirty_fields
+    if 'effects' in dirty:
+        changes['effects'] = _dump_objects(char.get_effects())
+    elif state['effects']:
+        ticks = _effect_ticks(char.get_effects(), state['effects'])
+        if ticks:
+            changes['effect_state'] = ticks
+
+    if dirty:
+        if 'cooldowns' in dirty:
+            cooldowns = _dump_cooldowns(char)
+            if cooldowns != state['cooldowns']:
+                changes['cooldowns'] = cooldowns
+        dirty.clear()
+
+    inventory = getattr(char, 'inventory', None)
+    if inventory is not None and inventory.dirty:
+        changes['items'] = _dump_objects(inventory.items)
+        inventory.dirty = False
+
+    return changes
+
+
+def _clear_dirty(char: Character):
+    char.dirty_fields.clear()
+    if hasattr(char, 'inventory'):
+        char.inventory.dirty = False
+
+
+def battle_state(battle: Battle) -> dict:
+    state = {
+        'round': battle.round_number,
+        'turn': battle.turn_order.position,
+        'units': [unit_state(char) for char in battle.party + [battle.boss]]
+    }
+    if isinstance(battle.boss, Boss):
+        state['phase'] = [battle.boss.phase, battle.boss.phase_rounds]
+    return state
+
+
+def full_snapshot(battle: Battle) -> dict:
+    snapshot = battle_state(battle)
+    snapshot['kind'] = 'full'
+    snapshot['roster'] = [[char.__class__.__name__, char.name, char.level] for char in battle.party]
+    snapshot['boss'] = [battle.boss.name, battle.boss.level]
+    if isinstance(battle.boss, Boss):
+        snapshot['phases'] = battle.boss.phase_script
+    return snapshot
+
+
+def diff_battle(battle: Battle, previous: dict) -> dict:
+    delta = {'kind': 'delta', 'round': battle.round_number}
+
+    turn = battle.turn_order.position
+    if turn != previous['turn']:
+        delta['turn'] = turn
+    if 'phase' in previous:
+        phase = [battle.boss.phase, battle.boss.phase_rounds]
+        if phase != previous['phase']:
+            delta['phase'] = phase
+
+    units = {}
+    for index, (char, state) in enumerate(zip(battle.party + [battle.boss], previous['units'])):
+        changes = unit_changes(char, state)
+        if changes:
+            units[str(index)] = changes
+    if units:
+        delta['units'] = units
+
+    return delta
+
+
+def apply_delta(state: dict, delta: dict):
+    state['round'] = delta['round']
+    for key in ('turn', 'phase'):
+        if key in delta:
+            state[key] = delta[key]
+    for index, changes in delta.get('units', {}).items():
+        unit = state['units'][int(index)]
+        for field, value in changes.items():
+            if field == 'effect_state':
+                for effect_index, attributes in value.items():
+                    unit['effects'][int(effect_index)][1].update(attributes)
+            else:
+                unit[field] = value
+
+
+def restore_battle(snapshot: dict) -> Battle:
+    party = [CHARACTER_CLASSES[class_name](name, level) for class_name, name, level in snapshot['roster']]
+    boss_name, boss_level = snapshot['boss']
+    battle = Battle(party, Boss(boss_name, boss_level, phases=snapshot.get('phases')))
+    battle.round_number = snapshot['round']
+
+    effect_classes = _subclasses(Effect)
+    item_classes = _subclasses(Item)
+
+    for char, state in zip(battle.party + [battle.boss], snapshot['units']):
+        char.hp = state['hp']
+        char.mp = state['mp']
+        char.damage_taken = state['damage_taken']
+        char.set_effects(_load_objects(state['effects'], effect_classes))
+        for skill, cooldown in zip(getattr(char, 'skills', []), state['cooldowns']):
+            skill.current_cooldown = cooldown
+        if hasattr(char, 'inventory'):
+            char.inventory.clear()
+            for item in _load_objects(state['items'], item_classes):
+                char.inventory.add_item(item)
+
+    if 'phase' in snapshot:
+        battle.boss.restore_phase(*snapshot['phase'])
+
+    battle.turn_order = TurnOrder(battle.party + [battle.boss])
+    battle.turn_order.position = snapshot['turn']
+    return battle
+
+
+class AutosaveJournal:
+
+    def __init__(self, path: str, compact_every: int = 20, fsync: bool = False, strict: bool = False,
+                 flush_rounds: int = 10, flush_interval: float = 0.5):
+        self.path = path
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self.strict = strict
+        self.flush_rounds = flush_rounds
+        self.flush_interval = flush_interval
+        self._battle: Optional[Battle] = None
+        self._state: Optional[dict] = None
+        self._records_since_compaction = 0
+        self._pending_rounds = 0
+        self._last_checkpoint = time.monotonic()
+        self._file = None
+
+    def attach(self, battle: Battle):
+        battle.autosave = self
+        self._battle = battle
+        self.compact(battle)
+
+    def record_round(self, battle: Battle):
+        self._pending_rounds += 1
+        if (self.strict or self._pending_rounds >= self.flush_rounds
+                or time.monotonic() - self._last_checkpoint >= self.flush_interval):
+            self.checkpoint(battle)
+
+    def checkpoint(self, battle: Battle):
+        if self._state is None or self._records_since_compaction + 1 >= self.compact_every:
+            self.compact(battle)
+            return
+
+        delta = diff_battle(battle, self._state)
+        self._write(delta)
+        apply_delta(self._state, delta)
+        self._records_since_compaction += 1
+        self._pending_rounds = 0
+        self._last_checkpoint = time.monotonic()
+
+    def compact(self, battle: Battle):
+        snapshot = full_snapshot(battle)
+        if self._file is not None:
+            self._file.close()
+
+        temp_path = self.path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(snapshot, ensure_ascii=False) + "\n")
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._state = snapshot
+        for char in battle.party + [battle.boss]:
+            _clear_dirty(char)
+        self._records_since_compaction = 0
+        self._pending_rounds = 0
+        self._last_checkpoint = time.monotonic()
+
+    def _write(self, record: dict):
+        self._file.write(DELTA_ENCODER.encode(record) + "\n")
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def close(self, remove: bool = False):
+        if self._file is not None:
+            if self._pending_rounds and not remove:
+                self.checkpoint(self._battle)
+            self._file.close()
+            self._file = None
+        if remove and os.path.exists(self.path):
+            os.remove(self.path)
+
+    @staticmethod
+    def load(path: str) -> Optional[Battle]:
+        if not os.path.exists(path):
+            return None
+
+        snapshot = None
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if record['kind'] == 'full':
+                    snapshot = record
+                elif snapshot is not None:
+                    apply_delta(snapshot, record)
+
+        return restore_battle(snapshot) if snapshot is not None else None
+
+
+def measure_overhead(battles: int, **journal_options) -> dict:
+    from characters import Warrior, Mage, Healer
+
+    round_time = 0.0
+    journal_time = 0.0
+    rounds = 0
+    with tempfile.TemporaryDirectory() as directory:
+        for seed in range(battles):
+            random.seed(seed)
+            battle = Battle([Warrior("Воин", 4), Mage("Маг", 4), Healer("Лекарь", 4)], Boss("Босс", 4))
+            journal = AutosaveJournal(os.path.join(directory, "autosave.journal"), **journal_options)
+            journal.attach(battle)
+            battle.autosave = None
+
+            with contextlib.redirect_stdout(None):
+                while not battle.is_finished:
+                    started = time.perf_counter()
+                    outcome = battle.play_round()
+                    played = time.perf_counter()
+                    journal.record_round(battle)
+                    round_time += played - started
+                    journal_time += time.perf_counter() - played
+                    rounds += 1
+                    if outcome is not None:
+                        break
+            journal.close(remove=True)
+
+    return {
+        'rounds': rounds,
+        'round_us': round_time / rounds * 1e6,
+        'journal_us': journal_time / rounds * 1e6,
+        'ratio': journal_time / round_time
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Доля времени автосохранения в раунде боя")
+    parser.add_argument("--battles", type=int, default=300)
+    parser.add_argument("--strict", action="store_true", help="Сбрасывать журнал на диск каждый раунд")
+    parser.add_argument("--fsync", action="store_true")
+    args = parser.parse_args()
+
+    report = measure_overhead(args.battles, strict=args.strict, fsync=args.fsync)
+    print(f"Раундов: {report['rounds']}")
+    print(f"Раунд без журнала: {report['round_us']:.1f} мкс, журнал: {report['journal_us']:.1f} мкс "
+          f"({report['ratio']:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,15 @@
-from typing import List, Iterator
+from typing import Callable, List, Iterator, Optional
 import json
 from datetime import datetime
 
 from core import Character, LoggerMixin
 from items import Inventory, HealthPotion, ManaPotion
+from pool import POOLS
+
+ACTION_ATTACK = "attack"
+ACTION_SKILL = "skill"
+ACTION_ITEM = "item"
+
 
 class TurnOrder(Iterator):
 
@@ -22,19 +28,29 @@ class TurnOrder(Iterator):
         if not self._participants:
             raise StopIteration("Нет живых участников")
 
-        self._participants = [p for p in self._participants if p.is_alive]
+        if not all(p.is_alive for p in self._participants):
+            self._participants = [p for p in self._participants if p.is_alive]
 
         if not self._participants:
             raise StopIteration("Все участники мертвы")
 
         if self._current_index >= len(self._participants):
             self._current_index = 0
+            self._participants.sort(key=lambda x: x.agility, reverse=True)
 
         participant = self._participants[self._current_index]
         self._current_index += 1
 
         return participant
 
+    @property
+    def position(self) -> int:
+        return self._current_index
+
+    @position.setter
+    def position(self, value: int):
+        self._current_index = value
+
     def get_current_order(self) -> List[str]:
         return [f"{p.name} (ловкость: {p.agility})" for p in self._participants]
 
@@ -44,37 +60,55 @@ class Battle(LoggerMixin):
     def __init__(self, party: List[Character], boss: Character):
         self.party = party
         self.boss = boss
-        self.turn_order = TurnOrder(party + [boss])
+        self._participants = party + [boss]
+        self.turn_order = TurnOrder(self._participants)
         self.round_number = 0
         self._battle_log = []
+        self._listeners = []
+        self.invariant_checker = None
+        self.autosave = None
 
         for character in party:
             if not hasattr(character, 'inventory'):
                 character.inventory = Inventory()
-            character.inventory.add_item(HealthPotion())
-            character.inventory.add_item(ManaPotion())
+            character.inventory.add_item(POOLS.acquire(HealthPotion))
+            character.inventory.add_item(POOLS.acquire(ManaPotion))
 
     def start(self) -> bool:
         self.log("НАЧАЛО БОЯ")
         self._log_event("Бой начинается!")
 
         while self._battle_continues():
-            self.round_number += 1
-            self._log_event(f"\n Раунд {self.round_number} ")
+            outcome = self.play_round()
+            if outcome is not None:
+                return outcome
 
-            self._process_round_effects()
+        return False
 
-            self._execute_turns()
+    def play_round(self) -> Optional[bool]:
+        self.round_number += 1
+        self._log_event(f"\n Раунд {self.round_number} ")
 
-            if not self.boss.is_alive:
-                self._log_event("ПОБЕДА! Босс повержен!")
-                return True
+        self._process_round_effects()
 
-            if not any(char.is_alive for char in self.party):
-                self._log_event("ПОРАЖЕНИЕ! Все члены пати мертвы!")
-                return False
+        self._execute_turns()
 
-        return False
+        if self.autosave is not None:
+            self.autosave.record_round(self)
+
+        if not self.boss.is_alive:
+            self._log_event("ПОБЕДА! Босс повержен!")
+            return True
+
+        if not any(char.is_alive for char in self.party):
+            self._log_event("ПОРАЖЕНИЕ! Все члены пати мертвы!")
+            return False
+
+        return None
+
+    @property
+    def is_finished(self) -> bool:
+        return not self._battle_continues()
 
     def _battle_continues(self) -> bool:
         return (self.boss.is_alive and
@@ -82,18 +116,14 @@ class Battle(LoggerMixin):
                 self.round_number < 50)
 
     def _process_round_effects(self):
-        all_participants = self.party + [self.boss]
-
-        for participant in all_participants:
+        for participant in self._participants:
             if participant.is_alive:
                 effect_results = participant.process_effects()
                 for result in effect_results:
                     self._log_event(result)
 
     def _execute_turns(self):
-        participants_copy = list(self.party) + [self.boss]
-
-        for participant in participants_copy:
+        for participant in self._participants:
             if not participant.is_alive:
                 continue
 
@@ -104,9 +134,15 @@ class Battle(LoggerMixin):
                 break
 
     def _execute_single_turn(self, character: Character):
-        if not character.is_alive:
-            return
-
+        checker = self.invariant_checker
+        if checker is not None and checker.begin_turn(self, character):
+            if character.is_alive:
+                self._take_turn(character)
+            checker.end_turn(self)
+        elif character.is_alive:
+            self._take_turn(character)
+
+    def _take_turn(self, character: Character):
         self._log_event(f"\nХод {character.name}:")
 
         if character == self.boss:
@@ -130,52 +166,67 @@ class Battle(LoggerMixin):
         self._log_event(result)
 
     def _player_character_turn(self, character: Character):
+        action = self._choose_action(character)
+        self._log_event(self._perform_action(character, action))
+
+    def _choose_action(self, character: Character) -> str:
         import random
 
         action = random.random()
 
         if action < 0.6:
-            if self.boss.is_alive:
-                result = character.basic_attack(self.boss)
-            else:
-                result = "Нет цели для атаки"
-
+            return ACTION_ATTACK
         elif action < 0.9 and character.mp > 10:
+            return ACTION_SKILL
+        return ACTION_ITEM
+
+    def _perform_action(self, character: Character, action: str) -> str:
+        if action == ACTION_ATTACK:
             if self.boss.is_alive:
-                result = character.use_skill(self.boss, 0)
-            else:
-                result = "Нет цели для навыка"
+                return character.basic_attack(self.boss)
+            return "Нет цели для атаки"
 
-        else:
-            if hasattr(character, 'inventory') and character.inventory.items_count > 0:
-                result = character.inventory.use_item(0, character)
-            else:
-                result = "Нет предметов для использования"
+        if action == ACTION_SKILL:
+            if self.boss.is_alive:
+                return character.use_skill(self.boss, 0)
+            return "Нет цели для навыка"
 
-        self._log_event(result)
+        if hasattr(character, 'inventory') and character.inventory.items_count > 0:
+            return character.inventory.use_item(0, character)
+        return "Нет предметов для использования"
 
     def _log_event(self, message: str):
         self._battle_log.append(f"[Раунд {self.round_number}] {message}")
         self.log(message)
+        for listener in self._listeners:
+            listener(self, message)
+
+    def add_listener(self, listener: Callable[['Battle', str], None]):
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[['Battle', str], None]):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
 
     def get_battle_log(self) -> List[str]:
         return self._battle_log
 
     def get_battle_status(self) -> str:
-        alive_party = [p for p in self.party if p.is_alive]
-        status = f"Раунд {self.round_number}\n"
-        status += f"Босс: {self.boss.hp:.1f}/{self.boss.max_hp} HP\n"
-        status += f"Живых в пати: {len(alive_party)}/{len(self.party)}\n"
+        alive_count = sum(1 for p in self.party if p.is_alive)
+        lines = [
+            f"Раунд {self.round_number}",
+            f"Босс: {self.boss.hp:.1f}/{self.boss.max_hp} HP",
+            f"Живых в пати: {alive_count}/{len(self.party)}"
+        ]
 
         for char in self.party:
-            status += f"{char.name}: {char.hp:.1f}/{char.max_hp} HP"
-            if not char.is_alive:
-                status += " 💀"
-            status += "\n"
+            suffix = "" if char.is_alive else " 💀"
+            lines.append(f"{char.name}: {char.hp:.1f}/{char.max_hp} HP{suffix}")
 
-        return status
+        lines.append("")
+        return "\n".join(lines)
 
-    def save_state(self, filename: str):
+    def get_state(self) -> dict:
         state = {
             'round_number': self.round_number,
             'boss': {
@@ -200,6 +251,11 @@ class Battle(LoggerMixin):
                 'level': char.level
             })
 
+        return state
+
+    def save_state(self, filename: str):
+        state = self.get_state()
+
         with open(filename, 'w', encoding='utf-8') as f:
             json.dump(state, f, indent=2, ensure_ascii=False)
 
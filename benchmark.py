@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+
+from pool import POOLS, freeze_static
+from simulation import run_battle, release_battle
+
+ROSTER = [('Warrior', 5), ('Mage', 5), ('Healer', 5)]
+CONFIGURATIONS = (
+    ("Без пулов", False, False),
+    ("Пулы", True, False),
+    ("gc.freeze", False, True),
+    ("Пулы и gc.freeze", True, True)
+)
+
+
+class GcMonitor:
+
+    def __init__(self):
+        self.collections = [0, 0, 0]
+        self.pause = 0.0
+        self._started = None
+
+    def __call__(self, phase: str, info: dict):
+        if phase == "start":
+            self._started = time.perf_counter()
+        else:
+            self.pause += time.perf_counter() - self._started
+            self.collections[info['generation']] += 1
+
+    def __enter__(self) -> 'GcMonitor':
+        gc.callbacks.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        gc.callbacks.remove(self)
+
+
+def _play(seed: int):
+    battle, _ = run_battle(ROSTER, 5, seed)
+    release_battle(battle)
+
+
+def _prepare(pooled: bool, frozen: bool):
+    POOLS.clear()
+    POOLS.enabled = pooled
+    gc.unfreeze()
+    gc.collect()
+    for seed in range(10):
+        _play(seed)
+    if frozen:
+        freeze_static()
+
+
+def measure_allocations(battles: int, pooled: bool) -> dict:
+    _prepare(pooled, False)
+    peaks = 0
+    blocks = 0
+    tracemalloc.start()
+    try:
+        for seed in range(battles):
+            tracemalloc.reset_peak()
+            blocks_before = sys.getallocatedblocks()
+            current_before = tracemalloc.get_traced_memory()[0]
+            _play(seed)
+            peaks += tracemalloc.get_traced_memory()[1] - current_before
+            blocks += sys.getallocatedblocks() - blocks_before
+    finally:
+        tracemalloc.stop()
+        POOLS.enabled = True
+
+    return {'peak_bytes': peaks / battles, 'retained_blocks': blocks / battles}
+
+
+def run(battles: int, pooled: bool, frozen: bool) -> dict:
+    _prepare(pooled, frozen)
+
+    started = time.perf_counter()
+    with GcMonitor() as monitor:
+        for seed in range(battles):
+            _play(seed)
+    elapsed = time.perf_counter() - started
+
+    gc.unfreeze()
+    POOLS.enabled = True
+    return {
+        'time': elapsed,
+        'collections': monitor.collections,
+        'gc_pause': monitor.pause
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сравнение боев с пулами объектов и gc.freeze по отдельности")
+    parser.add_argument("--battles", type=int, default=2000)
+    args = parser.parse_args()
+
+    for title, pooled, frozen in CONFIGURATIONS:
+        result = run(args.battles, pooled, frozen)
+        print(f"{title}: {result['time']:.2f} c, сборок GC по поколениям {result['collections']}, "
+              f"паузы GC {result['gc_pause'] * 1000:.1f} мс")
+
+    allocation_battles = max(1, args.battles // 10)
+    for title, pooled in (("Без пулов", False), ("Пулы", True)):
+        result = measure_allocations(allocation_battles, pooled)
+        print(f"Выделения за бой ({title}): пик {result['peak_bytes'] / 1024:.1f} КБ, "
+              f"удержано блоков {result['retained_blocks']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
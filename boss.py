@@ -1,7 +1,10 @@
 from abc import ABC, abstractmethod
+from bisect import bisect_left
 from core import Character, CritMixin
+from damage import scale
+from pool import POOLS
 from skills import FireballSkill, PoisonEffect, ShieldEffect
-from typing import List
+from typing import Callable, Dict, List
 
 
 class BossStrategy(ABC):
@@ -19,7 +22,7 @@ class AggressiveStrategy(BossStrategy):
             return "Нет целей для атаки"
 
         weakest_target = min(alive_targets, key=lambda x: x.hp)
-        damage = boss.strength * 1.2
+        damage = scale(boss.strength, 1.2)
         weakest_target.take_damage(damage)
         return f"Босс яростно атакует {weakest_target.name} и наносит {damage:.1f} урона!"
 
@@ -32,7 +35,7 @@ class AoeStrategy(BossStrategy):
             return "Нет целей для атаки"
 
         result = "Босс использует атаку по площади! "
-        damage = boss.strength * 0.8
+        damage = scale(boss.strength, 0.8)
         for target in alive_targets:
             target.take_damage(damage)
             result += f"{target.name} получает {damage:.1f} урона. "
@@ -49,16 +52,125 @@ class DebuffStrategy(BossStrategy):
 
         import random
         target = random.choice(alive_targets)
-        target.add_effect(PoisonEffect(10))
-        boss.add_effect(ShieldEffect(30))
+        target.add_effect(POOLS.acquire(PoisonEffect, 10))
+        boss.add_effect(POOLS.acquire(ShieldEffect, 30))
 
         return f"Босс накладывает яд на {target.name} и создает щит!"
 
 
+STRATEGIES: Dict[str, Callable[[], BossStrategy]] = {
+    'aggressive': AggressiveStrategy,
+    'aoe': AoeStrategy,
+    'debuff': DebuffStrategy
+}
+
+
+def _shield_action(boss: 'Boss', value: float) -> str:
+    boss.add_effect(POOLS.acquire(ShieldEffect, value))
+    return f"Босс создает щит прочностью {value}!"
+
+
+def _heal_action(boss: 'Boss', value: float) -> str:
+    amount = scale(boss.max_hp, value)
+    boss.heal(amount)
+    return f"Босс восстанавливает {amount:.1f} HP!"
+
+
+def _restore_mp_action(boss: 'Boss', value: float) -> str:
+    boss.mp = min(boss.max_mp, boss.mp + value)
+    return f"Босс восстанавливает {value} MP!"
+
+
+PHASE_ACTIONS: Dict[str, Callable[['Boss', float], str]] = {
+    'shield': _shield_action,
+    'heal': _heal_action,
+    'restore_mp': _restore_mp_action
+}
+
+DEFAULT_PHASES = [
+    {'name': 'phase1', 'strategy': 'aggressive', 'hp_above': 0.6},
+    {'name': 'phase2', 'strategy': 'aoe', 'hp_above': 0.3},
+    {'name': 'phase3', 'strategy': 'debuff', 'hp_above': 0.0}
+]
+
+
+class BossPhase:
+
+    __slots__ = ('name', 'strategy', 'hp_above', 'on_enter', 'timer_rounds', 'timer_next')
+
+    def __init__(self, name: str, strategy: BossStrategy, hp_above: float, on_enter: tuple,
+                 timer_rounds: int = 0, timer_next: str = None):
+        self.name = name
+        self.strategy = strategy
+        self.hp_above = hp_above
+        self.on_enter = on_enter
+        self.timer_rounds = timer_rounds
+        self.timer_next = timer_next
+
+
+def compile_phases(phases: List[dict]) -> List[BossPhase]:
+    if not phases:
+        raise ValueError("Сценарий босса должен содержать хотя бы одну фазу")
+
+    compiled = []
+    for data in phases:
+        strategy_name = data.get('strategy')
+        if strategy_name not in STRATEGIES:
+            raise ValueError(f"Неизвестная стратегия: {strategy_name}")
+
+        actions = []
+        for action_name, value in data.get('on_enter', []):
+            if action_name not in PHASE_ACTIONS:
+                raise ValueError(f"Неизвестное действие фазы: {action_name}")
+            actions.append((PHASE_ACTIONS[action_name], value))
+
+        timer = data.get('timer', {})
+        compiled.append(BossPhase(
+            data['name'],
+            STRATEGIES[strategy_name](),
+            data.get('hp_above', 0.0),
+            tuple(actions),
+            timer.get('rounds', 0),
+            timer.get('next')
+        ))
+
+    compiled.sort(key=lambda phase: phase.hp_above, reverse=True)
+
+    names = {phase.name for phase in compiled}
+    if len(names) != len(compiled):
+        raise ValueError("Имена фаз должны быть уникальными")
+    for phase in compiled:
+        if phase.timer_rounds and phase.timer_next not in names:
+            raise ValueError(f"Неизвестная фаза в таймере: {phase.timer_next}")
+
+    return compiled
+
+
 class Boss(Character, CritMixin):
 
-    def __init__(self, name: str, level: int = 5):
+    crit_chance = 0.2
+    crit_multiplier = 2.0
+
+    def __init__(self, name: str, level: int = 5, phases: List[dict] = None):
         super().__init__(name, level, fraction="boss")
+        self._phase_script = phases or DEFAULT_PHASES
+        self._phases = compile_phases(self._phase_script)
+        self._strategies = {phase.name: phase.strategy for phase in self._phases}
+        self._phase_messages = []
+        self._compile_thresholds()
+        self._set_phase(self._phase_for_hp(self.hp))
+
+    def reset(self, name: str, level: int = 5, phases: List[dict] = None):
+        super().reset(name, level)
+        self._phase_script = phases or DEFAULT_PHASES
+        self._phases = compile_phases(self._phase_script)
+        self._strategies = {phase.name: phase.strategy for phase in self._phases}
+        self._phase_messages.clear()
+        self._compile_thresholds()
+        self._set_phase(self._phase_for_hp(self.hp))
+
+    def _init_stats(self):
+        level = self.level
         self.strength = 15 + level * 3
         self.agility = 20 + level * 2
         self.intellect = 15 + level * 2
@@ -67,34 +179,99 @@ class Boss(Character, CritMixin):
         self.max_mp = 100 + level * 20
         self.mp = self.max_mp
 
-        self._strategies = {
-            'phase1': AggressiveStrategy(),
-            'phase2': AoeStrategy(),
-            'phase3': DebuffStrategy()
-        }
-        self._current_strategy = self._strategies['phase1']
+    @property
+    def phase_script(self) -> List[dict]:
+        return self._phase_script
+
+    @property
+    def phase(self) -> str:
+        return self._phases[self._phase_index].name
+
+    def _compile_thresholds(self):
+        floors = [phase.hp_above * self.max_hp for phase in self._phases]
+        floors[-1] = float('-inf')
+        self._phase_floors = floors
+        self._ascending_floors = floors[::-1]
+
+    def _phase_for_hp(self, hp: float) -> int:
+        position = bisect_left(self._ascending_floors, hp) - 1
+        return len(self._phases) - 1 - position
+
+    def _set_phase(self, index: int, forced: bool = False):
+        self._phase_index = index
+        self._current_strategy = self._phases[index].strategy
+        self._phase_rounds = 0
+
+        if forced:
+            hp_index = self._phase_for_hp(self.hp)
+            self._phase_floor = min(self._phase_floors[index], self._phase_floors[hp_index])
+            self._phase_ceiling = float('inf')
+        else:
+            self._phase_floor = self._phase_floors[index]
+            self._phase_ceiling = self._phase_floors[index - 1] if index > 0 else float('inf')
+
+    def _enter_phase(self, index: int, forced: bool = False) -> List[str]:
+        self._set_phase(index, forced)
+        phase = self._phases[index]
+        messages = [f"Босс переходит в фазу '{phase.name}'!"]
+        for action, value in phase.on_enter:
+            messages.append(action(self, value))
+        return messages
+
+    def _check_phase_thresholds(self):
+        if not self.is_alive:
+            return
+        if self.hp <= self._phase_floor or self.hp > self._phase_ceiling:
+            index = self._phase_for_hp(self.hp)
+            if index != self._phase_index:
+                self._phase_messages.extend(self._enter_phase(index))
+
+    def take_damage(self, damage: int):
+        super().take_damage(damage)
+        self._check_phase_thresholds()
+
+    def heal(self, amount: int):
+        super().heal(amount)
+        self._check_phase_thresholds()
+
+    def process_effects(self) -> List[str]:
+        results = super().process_effects()
+
+        phase = self._phases[self._phase_index]
+        if phase.timer_rounds and self.is_alive:
+            self._phase_rounds += 1
+            if self._phase_rounds >= phase.timer_rounds:
+                self._phase_messages.append(self.change_phase(phase.timer_next))
+
+        results.extend(self._phase_messages)
+        self._phase_messages.clear()
+        return results
 
     def basic_attack(self, target: Character) -> str:
-        damage = self.strength * 1.0
-        damage = self.calculate_crit(damage, crit_chance=0.2, crit_multiplier=2.0)
-        target.take_damage(damage)
+        damage = self.deal_damage(target, scale(self.strength, 1.0))
         return f"Босс {self.name} атакует {target.name} и наносит {damage:.1f} урона!"
 
     def use_skill(self, target: Character, skill_index: int = 0) -> str:
-        hp_percent = self.hp / self.max_hp
+        result = self._current_strategy.execute(self, target if isinstance(target, list) else [target])
+        if self._phase_messages:
+            result = " ".join(self._phase_messages) + " " + result
+            self._phase_messages.clear()
+        return result
 
-        if hp_percent > 0.6:
-            self._current_strategy = self._strategies['phase1']
-        elif hp_percent > 0.3:
-            self._current_strategy = self._strategies['phase2']
-        else:
-            self._current_strategy = self._strategies['phase3']
+    @property
+    def phase_rounds(self) -> int:
+        return self._phase_rounds
 
-        return f"Фаза босса изменена! " + self._current_strategy.execute(self, target if isinstance(target, list) else [
-            target])
+    def restore_phase(self, phase_name: str, phase_rounds: int = 0):
+        for index, phase in enumerate(self._phases):
+            if phase.name == phase_name:
+                self._set_phase(index, forced=self._phase_for_hp(self.hp) != index)
+                self._phase_rounds = phase_rounds
+                return
+        raise ValueError(f"Неизвестная фаза: {phase_name}")
 
     def change_phase(self, phase_name: str):
-        if phase_name in self._strategies:
-            self._current_strategy = self._strategies[phase_name]
-            return f"Босс переходит в фазу '{phase_name}'!"
-        return "Неизвестная фаза"
\ No newline at end of file
+        for index, phase in enumerate(self._phases):
+            if phase.name == phase_name:
+                return " ".join(self._enter_phase(index, forced=True))
+        return "Неизвестная фаза"
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+import contextlib
+import json
+import time
+from collections import deque
+from typing import List, Optional, Set
+
+from battle import Battle
+
+POLICY_DROP_OLDEST = "drop_oldest"
+POLICY_LATEST = "latest"
+
+
+class Subscription:
+
+    def __init__(self, broadcaster: 'Broadcaster', maxsize: int, policy: str):
+        if policy not in (POLICY_DROP_OLDEST, POLICY_LATEST):
+            raise ValueError(f"Неизвестная политика очереди: {policy}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.dropped = 0
+        self.closed = False
+        self._broadcaster = broadcaster
+        self._frames = deque()
+        self._ready = asyncio.Event()
+
+    def _deliver(self, frame: bytes):
+        if len(self._frames) >= self.maxsize:
+            if self.policy == POLICY_LATEST:
+                self.dropped += len(self._frames)
+                self._frames.clear()
+            else:
+                self._frames.popleft()
+                self.dropped += 1
+        self._frames.append(frame)
+        self._ready.set()
+
+    @property
+    def pending(self) -> int:
+        return len(self._frames)
+
+    async def get(self) -> Optional[bytes]:
+        while not self._frames:
+            if self.closed:
+                return None
+            self._ready.clear()
+            await self._ready.wait()
+        return self._frames.popleft()
+
+    def close(self):
+        self.closed = True
+        self._ready.set()
+        self._broadcaster.unsubscribe(self)
+
+    def __aiter__(self) -> 'Subscription':
+        return self
+
+    async def __anext__(self) -> bytes:
+        frame = await self.get()
+        if frame is None:
+            raise StopAsyncIteration
+        return frame
+
+
+class Broadcaster:
+
+    def __init__(self, tick: float = 0.05):
+        self.tick = tick
+        self.frames_sent = 0
+        self._subscribers: Set[Subscription] = set()
+        self._pending: List[bytes] = []
+        self._battle: Optional[Battle] = None
+
+    def subscribe(self, maxsize: int = 64, policy: str = POLICY_DROP_OLDEST) -> Subscription:
+        subscription = Subscription(self, maxsize, policy)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self._subscribers.discard(subscription)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def attach(self, battle: Battle):
+        self._battle = battle
+        battle.add_listener(self._on_battle_event)
+
+    def _on_battle_event(self, battle: Battle, message: str):
+        self.publish({'type': 'event', 'round': battle.round_number, 'message': message.strip()})
+
+    def publish(self, event: dict):
+        self._pending.append(json.dumps(event, ensure_ascii=False).encode())
+
+    def _status(self) -> dict:
+        battle = self._battle
+        return {
+            'type': 'status',
+            'round': battle.round_number,
+            'units': [[char.name, char.hp, char.max_hp, char.mp] for char in battle.party + [battle.boss]]
+        }
+
+    def flush(self) -> Optional[bytes]:
+        if not self._pending:
+            return None
+
+        if self._battle is not None:
+            self.publish(self._status())
+
+        frame = b"[" + b",".join(self._pending) + b"]"
+        self._pending.clear()
+
+        for subscription in self._subscribers:
+            subscription._deliver(frame)
+        self.frames_sent += 1
+        return frame
+
+    async def run(self, stop: asyncio.Event):
+        while not stop.is_set():
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(stop.wait(), self.tick)
+            self.flush()
+
+        for subscription in list(self._subscribers):
+            subscription.close()
+
+
+class LoadTestClient:
+
+    def __init__(self, subscription: Subscription, delay: float = 0.0):
+        self.subscription = subscription
+        self.delay = delay
+        self.frames = 0
+        self.events = 0
+        self.bytes = 0
+        self.last_status: Optional[dict] = None
+
+    async def run(self):
+        async for frame in self.subscription:
+            self.frames += 1
+            self.bytes += len(frame)
+            events = json.loads(frame)
+            self.events += len(events)
+            if events and events[-1]['type'] == 'status':
+                self.last_status = events[-1]
+            if self.delay:
+                await asyncio.sleep(self.delay)
+
+
+async def run_load_test(battle: Battle, subscribers: int = 1000, slow_fraction: float = 0.1,
+                        slow_delay: float = 0.2, tick: float = 0.02, round_delay: float = 0.005) -> dict:
+    broadcaster = Broadcaster(tick)
+    broadcaster.attach(battle)
+
+    slow_count = int(subscribers * slow_fraction)
+    clients = []
+    for i in range(subscribers):
+        slow = i < slow_count
+        subscription = broadcaster.subscribe(maxsize=8, policy=POLICY_LATEST if slow else POLICY_DROP_OLDEST)
+        clients.append(LoadTestClient(subscription, slow_delay if slow else 0.0))
+
+    stop = asyncio.Event()
+    client_tasks = [asyncio.create_task(client.run()) for client in clients]
+    broadcaster_task = asyncio.create_task(broadcaster.run(stop))
+
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(None):
+        battle.log("НАЧАЛО БОЯ")
+        while not battle.is_finished:
+            if battle.play_round() is not None:
+                break
+            await asyncio.sleep(round_delay)
+
+    stop.set()
+    await broadcaster_task
+    await asyncio.gather(*client_tasks)
+
+    return {
+        'subscribers': subscribers,
+        'frames_sent': broadcaster.frames_sent,
+        'elapsed': time.perf_counter() - started,
+        'frames_received': sum(client.frames for client in clients),
+        'events_received': sum(client.events for client in clients),
+        'dropped': sum(client.subscription.dropped for client in clients),
+        'final_round': battle.round_number,
+        'clients': clients
+    }
+
+
+def main():
+    from boss import Boss
+    from characters import Warrior, Mage, Healer
+
+    parser = argparse.ArgumentParser(description="Нагрузочный тест трансляции боя зрителям")
+    parser.add_argument("--subscribers", type=int, default=5000)
+    parser.add_argument("--slow-fraction", type=float, default=0.1)
+    args = parser.parse_args()
+
+    battle = Battle([Warrior("Воин", 5), Mage("Маг", 5), Healer("Лекарь", 5)], Boss("Босс", 5))
+    report = asyncio.run(run_load_test(battle, args.subscribers, args.slow_fraction))
+
+    print(f"Зрителей: {report['subscribers']}, раундов: {report['final_round']}")
+    print(f"Кадров отправлено: {report['frames_sent']} за {report['elapsed']:.2f} c")
+    print(f"Кадров получено: {report['frames_received']}, событий: {report['events_received']}")
+    print(f"Отброшено у медленных зрителей: {report['dropped']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+import json
+import multiprocessing
+import os
+from typing import Dict, Iterator, List, NamedTuple, Sequence, Set, Tuple
+
+from simulation import Roster, run_battle, release_battle, worker_pool
+
+
+class WorkUnit(NamedTuple):
+    unit_id: str
+    roster: Tuple[Tuple[str, int], ...]
+    boss_level: int
+    seed_start: int
+    seed_stop: int
+    seed_step: int = 1
+
+    @property
+    def seeds(self) -> range:
+        return range(self.seed_start, self.seed_stop, self.seed_step)
+
+
+def roster_key(roster: Roster) -> str:
+    return ",".join(f"{class_name}:{level}" for class_name, level in roster)
+
+
+class Campaign:
+
+    def __init__(self, rosters: Sequence[Roster], boss_levels: Sequence[int], seeds: range,
+                 unit_size: int = 500):
+        if unit_size <= 0:
+            raise ValueError("Размер единицы работы должен быть положительным")
+        self.rosters = [tuple(tuple(member) for member in roster) for roster in rosters]
+        self.boss_levels = list(boss_levels)
+        self.seeds = seeds
+        self.unit_size = unit_size
+
+    def units(self) -> Iterator[WorkUnit]:
+        for roster in self.rosters:
+            key = roster_key(roster)
+            for boss_level in self.boss_levels:
+                for start in range(0, len(self.seeds), self.unit_size):
+                    chunk = self.seeds[start:start + self.unit_size]
+                    if not chunk:
+                        continue
+                    seed_range = f"{chunk.start}-{chunk.stop}"
+                    if chunk.step != 1:
+                        seed_range += f":{chunk.step}"
+                    yield WorkUnit(f"{key}|{boss_level}|{seed_range}",
+                                   roster, boss_level, chunk.start, chunk.stop, chunk.step)
+
+
+def run_unit(unit: WorkUnit) -> dict:
+    result = {
+        'unit': unit.unit_id,
+        'roster': roster_key(unit.roster),
+        'boss_level': unit.boss_level,
+        'battles': 0,
+        'wins': 0,
+        'rounds': 0,
+        'boss_damage': 0.0,
+        'party_damage': 0.0
+    }
+
+    for seed in unit.seeds:
+        battle, victory = run_battle(unit.roster, unit.boss_level, seed)
+        result['battles'] += 1
+        result['wins'] += int(victory)
+        result['rounds'] += battle.round_number
+        result['boss_damage'] += battle.boss.damage_taken
+        result['party_damage'] += sum(char.damage_taken for char in battle.party)
+        release_battle(battle)
+
+    return result
+
+
+class Journal:
+
+    def __init__(self, path: str):
+        self.path = path
+        self._results: Dict[str, dict] = {}
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+
+        valid_size = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                self._results[record['unit']] = record
+                valid_size += len(line)
+
+        if valid_size != os.path.getsize(self.path):
+            with open(self.path, 'r+b') as f:
+                f.truncate(valid_size)
+
+    @property
+    def completed(self) -> Set[str]:
+        return set(self._results)
+
+    def append(self, record: dict):
+        if record['unit'] in self._results:
+            return
+
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._results[record['unit']] = record
+
+    def results(self) -> List[dict]:
+        return list(self._results.values())
+
+
+class CampaignRunner:
+
+    def __init__(self, campaign: Campaign, journal_path: str, workers: int = None):
+        self.campaign = campaign
+        self.journal = Journal(journal_path)
+        self.workers = workers or multiprocessing.cpu_count()
+        self.executed = 0
+
+    def pending_units(self) -> List[WorkUnit]:
+        completed = self.journal.completed
+        return [unit for unit in self.campaign.units() if unit.unit_id not in completed]
+
+    def run(self, limit: int = None) -> Dict[Tuple[str, int], dict]:
+        pending = self.pending_units()
+        if limit is not None:
+            pending = pending[:limit]
+
+        if pending:
+            with worker_pool(min(self.workers, len(pending))) as pool:
+                for record in pool.imap_unordered(run_unit, pending, chunksize=1):
+                    self.journal.append(record)
+                    self.executed += 1
+
+        return self.summary()
+
+    def summary(self) -> Dict[Tuple[str, int], dict]:
+        unit_ids = {unit.unit_id for unit in self.campaign.units()}
+        totals: Dict[Tuple[str, int], dict] = {}
+        for record in self.journal.results():
+            if record['unit'] not in unit_ids:
+                continue
+            key = (record['roster'], record['boss_level'])
+            total = totals.setdefault(key, {'battles': 0, 'wins': 0, 'rounds': 0,
+                                            'boss_damage': 0.0, 'party_damage': 0.0})
+            for field in total:
+                total[field] += record[field]
+
+        for total in totals.values():
+            battles = total['battles'] or 1
+            total['win_rate'] = total['wins'] / battles
+            total['avg_rounds'] = total['rounds'] / battles
+
+        return totals
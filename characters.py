@@ -1,11 +1,19 @@
 from core import Character, CritMixin
+from damage import scale
+from pool import POOLS
 from skills import FireballSkill, HealSkill, PowerStrikeSkill, PoisonEffect
 
 
 class Warrior(Character, CritMixin):
 
+    crit_chance = 0.15
+
     def __init__(self, name: str, level: int = 1):
         super().__init__(name, level, fraction="party")
+        self.skills = [PowerStrikeSkill()]
+
+    def _init_stats(self):
+        level = self.level
         self.strength = 20 + level * 2
         self.agility = 15 + level
         self.intellect = 5 + level
@@ -14,8 +22,6 @@ class Warrior(Character, CritMixin):
         self.max_mp = 30 + level * 2
         self.mp = self.max_mp
 
-        self.skills = [PowerStrikeSkill()]
-
     def basic_attack(self, target: Character) -> str:
         if not self.is_alive:
             return f"{self.name} мертв и не может атаковать!"
@@ -23,9 +29,7 @@ class Warrior(Character, CritMixin):
             return f"{target.name} уже мертв!"
         if not self.is_enemy(target):
             return f"{self.name} не может атаковать союзника {target.name}!"
-        damage = self.strength * 0.8
-        damage = self.calculate_crit(damage, crit_chance=0.15)
-        target.take_damage(damage)
+        damage = self.deal_damage(target, scale(self.strength, 0.8))
         return f"{self.name} атакует {target.name} и наносит {damage:.1f} урона!"
 
     def use_skill(self, target: Character, skill_index: int = 0) -> str:
@@ -39,8 +43,14 @@ class Warrior(Character, CritMixin):
 
 class Mage(Character, CritMixin):
 
+    crit_chance = 0.0
+
     def __init__(self, name: str, level: int = 1):
         super().__init__(name, level, fraction="party")
+        self.skills = [FireballSkill()]
+
+    def _init_stats(self):
+        level = self.level
         self.strength = 5 + level
         self.agility = 10 + level
         self.intellect = 25 + level * 3
@@ -49,8 +59,6 @@ class Mage(Character, CritMixin):
         self.max_mp = 80 + level * 10
         self.mp = self.max_mp
 
-        self.skills = [FireballSkill()]
-
     def basic_attack(self, target: Character) -> str:
         if not self.is_alive:
             return f"{self.name} мертв и не может атаковать!"
@@ -58,8 +66,7 @@ class Mage(Character, CritMixin):
             return f"{target.name} уже мертв!"
         if not self.is_enemy(target):
             return f"{self.name} не может атаковать союзника {target.name}!"
-        damage = self.intellect * 0.6
-        target.take_damage(damage)
+        damage = self.deal_damage(target, scale(self.intellect, 0.6))
         return f"{self.name} атакует {target.name} магией и наносит {damage:.1f} урона!"
 
     def use_skill(self, target: Character, skill_index: int = 0) -> str:
@@ -69,7 +76,7 @@ class Mage(Character, CritMixin):
             skill = self.skills[skill_index]
             result = skill.use(self, target)
             if skill_index == 0 and self.mp > 20:
-                target.add_effect(PoisonEffect(5))
+                target.add_effect(POOLS.acquire(PoisonEffect, 5))
                 result += " Цель отравлена!"
             return result
         return "Неверный индекс навыка!"
@@ -79,6 +86,10 @@ class Healer(Character):
 
     def __init__(self, name: str, level: int = 1):
         super().__init__(name, level, fraction="party")
+        self.skills = [HealSkill()]
+
+    def _init_stats(self):
+        level = self.level
         self.strength = 8 + level
         self.agility = 12 + level
         self.intellect = 20 + level * 2
@@ -87,8 +98,6 @@ class Healer(Character):
         self.max_mp = 60 + level * 8
         self.mp = self.max_mp
 
-        self.skills = [HealSkill()]
-
     def basic_attack(self, target: Character) -> str:
         if not self.is_alive:
             return f"{self.name} мертв и не может атаковать!"
@@ -96,8 +105,7 @@ class Healer(Character):
             return f"{target.name} уже мертв!"
         if not self.is_enemy(target):
             return f"{self.name} не может атаковать союзника {target.name}!"
-        damage = self.strength * 0.7
-        target.take_damage(damage)
+        damage = self.deal_damage(target, scale(self.strength, 0.7))
         return f"{self.name} атакует {target.name} и наносит {damage:.1f} урона!"
 
     def use_skill(self, target: Character, skill_index: int = 0) -> str:
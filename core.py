@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
 import random
-from typing import List, Optional
+from typing import Dict, List, Optional, Set
+
+from damage import DamageModifier, CritModifier, ResistanceModifier, build_chain, apply_chain, scale, quantize
+from pool import POOLS
 
 
 class BoundedStat:
@@ -24,6 +27,63 @@ class BoundedStat:
         setattr(obj, self.name, value)
 
 
+class ModifiableStat(BoundedStat):
+
+    def __set_name__(self, owner, name):
+        super().__set_name__(owner, name)
+        self.stat = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        effective = obj._effective_stats
+        value = effective.get(self.stat)
+        if value is None:
+            value = effective[self.stat] = self._compute(obj)
+        return value
+
+    def __set__(self, obj, value):
+        super().__set__(obj, value)
+        obj._effective_stats.pop(self.stat, None)
+
+    def _compute(self, obj) -> float:
+        base = getattr(obj, self.name, 0)
+        modifiers = obj._stat_modifiers.get(self.stat)
+        if not modifiers:
+            return base
+
+        add = 0
+        mult = 1.0
+        for modifier in modifiers:
+            add += modifier.add
+            mult *= modifier.mult
+
+        value = quantize(base + add)
+        if mult != 1.0:
+            value = scale(value, mult)
+        return max(self.min_value, value)
+
+
+class StatModifier:
+
+    def __init__(self, stat: str, add: float = 0, mult: float = 1.0):
+        self._stat = stat
+        self._add = add
+        self._mult = mult
+
+    @property
+    def stat(self) -> str:
+        return self._stat
+
+    @property
+    def add(self) -> float:
+        return self._add
+
+    @property
+    def mult(self) -> float:
+        return self._mult
+
+
 class LoggerMixin:
 
     def log(self, message: str):
@@ -32,10 +92,17 @@ class LoggerMixin:
 
 class CritMixin:
 
-    def calculate_crit(self, base_damage: float, crit_chance: float = 0.1, crit_multiplier: float = 1.5) -> float:
+    crit_chance = 0.1
+    crit_multiplier = 1.5
+
+    def calculate_crit(self, base_damage: float, crit_chance: float = None, crit_multiplier: float = None) -> float:
+        if crit_chance is None:
+            crit_chance = self.crit_chance
+        if crit_multiplier is None:
+            crit_multiplier = self.crit_multiplier
         if random.random() < crit_chance:
             print("КРИТИЧЕСКИЙ УДАР!")
-            return base_damage * crit_multiplier
+            return scale(base_damage, crit_multiplier)
         return base_damage
 
 
@@ -45,14 +112,20 @@ class Human:
     max_hp = BoundedStat(1, 1000)
     mp = BoundedStat(0, 500)
     max_mp = BoundedStat(0, 500)
-    strength = BoundedStat(1, 100)
-    agility = BoundedStat(1, 100)
-    intellect = BoundedStat(1, 100)
+    strength = ModifiableStat(1, 100)
+    agility = ModifiableStat(1, 100)
+    intellect = ModifiableStat(1, 100)
 
     def __init__(self, name: str, level: int = 1):
         self._name = name
         self._level = level
+        self._stat_modifiers: Dict[str, List[StatModifier]] = {}
+        self._effective_stats: Dict[str, float] = {}
+        self._init_stats()
+        self.damage_taken = 0
 
+    def _init_stats(self):
+        level = self.level
         self.max_hp = 50 + level * 10
         self.hp = self.max_hp
         self.max_mp = 20 + level * 5
@@ -73,8 +146,20 @@ class Human:
     def is_alive(self) -> bool:
         return self.hp > 0
 
+    def add_stat_modifier(self, modifier: StatModifier):
+        self._stat_modifiers.setdefault(modifier.stat, []).append(modifier)
+        self._effective_stats.pop(modifier.stat, None)
+
+    def remove_stat_modifier(self, modifier: StatModifier):
+        modifiers = self._stat_modifiers.get(modifier.stat)
+        if modifiers and modifier in modifiers:
+            modifiers.remove(modifier)
+            self._effective_stats.pop(modifier.stat, None)
+
     def take_damage(self, damage: int):
+        old_hp = self.hp
         self.hp = max(0, self.hp - damage)
+        self.damage_taken += old_hp - self.hp
 
     def heal(self, amount: int):
         self.hp = min(self.max_hp, self.hp + amount)
@@ -88,11 +173,41 @@ class Human:
 
 class Character(Human, ABC):
 
+    invariant_checker = None
+
     def __init__(self, name: str, level: int = 1, fraction: str = "party"):
         super().__init__(name, level)
         self._active_effects = []
         self._cooldowns = {}
         self.fraction = fraction
+        self._resistance = 0.0
+        self._damage_modifiers: List[DamageModifier] = []
+        self._attack_chain = None
+        self._damage_chain = None
+        self.dirty_fields: Set[str] = set()
+
+    def reset(self, name: str, level: int = 1):
+        self._name = name
+        self._level = level
+        self._stat_modifiers.clear()
+        self._effective_stats.clear()
+        self._init_stats()
+        self.damage_taken = 0
+
+        for effect in self._active_effects:
+            POOLS.release(effect)
+        self._active_effects.clear()
+        self._cooldowns.clear()
+        self._damage_modifiers.clear()
+        self._resistance = 0.0
+        self._damage_chain = None
+        self.dirty_fields.clear()
+        self.__dict__.pop('invariant_checker', None)
+
+        for skill in getattr(self, 'skills', []):
+            skill.reset()
+        if hasattr(self, 'inventory'):
+            self.inventory.clear()
 
     def is_ally(self, target: 'Character') -> bool:
         return self.fraction == target.fraction
@@ -114,9 +229,73 @@ class Character(Human, ABC):
     def use_skill(self, target: 'Character', skill_index: int = 0) -> str:
         pass
 
+    @property
+    def resistance(self) -> float:
+        return self._resistance
+
+    @resistance.setter
+    def resistance(self, value: float):
+        if not (0 <= value <= 1):
+            raise ValueError(f"Сопротивление {value} должно быть между 0 и 1")
+        self._resistance = value
+        self._damage_chain = None
+
+    def add_damage_modifier(self, modifier: DamageModifier):
+        self._damage_modifiers.append(modifier)
+        self._damage_chain = None
+
+    def remove_damage_modifier(self, modifier: DamageModifier):
+        if modifier in self._damage_modifiers:
+            self._damage_modifiers.remove(modifier)
+            self._damage_chain = None
+
+    @property
+    def attack_chain(self) -> tuple:
+        if self._attack_chain is None:
+            modifiers = []
+            if getattr(self, 'crit_chance', 0) > 0:
+                modifiers.append(CritModifier(self))
+            self._attack_chain = build_chain(modifiers)
+        return self._attack_chain
+
+    @property
+    def damage_chain(self) -> tuple:
+        if self._damage_chain is None:
+            modifiers = list(self._damage_modifiers)
+            if self._resistance:
+                modifiers.append(ResistanceModifier(self._resistance))
+            modifiers.extend(effect for effect in self._active_effects if isinstance(effect, DamageModifier))
+            self._damage_chain = build_chain(modifiers)
+        return self._damage_chain
+
+    def deal_damage(self, target: 'Character', base_damage: float) -> float:
+        if self.invariant_checker is not None and self.invariant_checker.active:
+            self.invariant_checker.on_damage(self, target)
+        damage = apply_chain(self.attack_chain, base_damage)
+        target.take_damage(damage)
+        return damage
+
+    def take_damage(self, damage: int):
+        super().take_damage(apply_chain(self.damage_chain, damage))
+
     def add_effect(self, effect: 'Effect'):
+        self.dirty_fields.add('effects')
         self._active_effects.append(effect)
         effect.on_apply(self)
+        if isinstance(effect, DamageModifier):
+            self._damage_chain = None
+
+    def get_effects(self) -> List['Effect']:
+        return list(self._active_effects)
+
+    def set_effects(self, effects: List['Effect']):
+        for effect in self._active_effects:
+            effect.on_remove(self)
+        self._active_effects[:] = effects
+        for effect in effects:
+            effect.on_apply(self)
+        self._damage_chain = None
+        self.dirty_fields.add('effects')
 
     def process_effects(self) -> List[str]:
         results = []
@@ -129,9 +308,15 @@ class Character(Human, ABC):
             if effect.is_expired():
                 expired_effects.append(effect)
 
+        if expired_effects:
+            self.dirty_fields.add('effects')
         for effect in expired_effects:
             self._active_effects.remove(effect)
+            effect.on_remove(self)
             results.append(f"Эффект {effect.name} закончился")
+            if isinstance(effect, DamageModifier):
+                self._damage_chain = None
+            POOLS.release(effect)
 
         return results
 
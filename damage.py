@@ -0,0 +1,75 @@
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Callable, Iterable, Tuple
+
+if TYPE_CHECKING:
+    from core import Character
+
+DamageStage = Callable[[float], float]
+
+FIXED_POINT_SCALE = 1000
+
+_fixed_point = False
+
+
+def set_fixed_point(enabled: bool):
+    global _fixed_point
+    _fixed_point = enabled
+
+
+def is_fixed_point() -> bool:
+    return _fixed_point
+
+
+def quantize(value: float) -> float:
+    if not _fixed_point:
+        return value
+    return (round(value * FIXED_POINT_SCALE) + FIXED_POINT_SCALE // 2) // FIXED_POINT_SCALE
+
+
+def scale(value: float, factor: float) -> float:
+    if not _fixed_point:
+        return value * factor
+    return (int(value) * round(factor * FIXED_POINT_SCALE) + FIXED_POINT_SCALE // 2) // FIXED_POINT_SCALE
+
+
+class DamageModifier(ABC):
+
+    order = 50
+
+    @abstractmethod
+    def modify(self, damage: float) -> float:
+        pass
+
+
+class CritModifier(DamageModifier):
+
+    order = 0
+
+    def __init__(self, owner: 'Character'):
+        self.owner = owner
+
+    def modify(self, damage: float) -> float:
+        return self.owner.calculate_crit(damage)
+
+
+class ResistanceModifier(DamageModifier):
+
+    order = 10
+
+    def __init__(self, resistance: float):
+        self.resistance = resistance
+
+    def modify(self, damage: float) -> float:
+        return scale(damage, 1 - self.resistance)
+
+
+def build_chain(modifiers: Iterable[DamageModifier]) -> Tuple[DamageStage, ...]:
+    return tuple(modifier.modify for modifier in sorted(modifiers, key=lambda m: m.order))
+
+
+def apply_chain(chain: Tuple[DamageStage, ...], damage: float) -> float:
+    for stage in chain:
+        damage = stage(damage)
+        if damage <= 0:
+            return 0
+    return damage
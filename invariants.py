@@ -0,0 +1,92 @@
+import json
+import os
+import random
+from typing import TYPE_CHECKING, List
+
+if TYPE_CHECKING:
+    from battle import Battle
+    from core import Character
+    from skills import Skill
+
+
+class InvariantViolation(AssertionError):
+    pass
+
+
+class InvariantChecker:
+
+    def __init__(self, battle_rate: float = 1.0, turn_rate: float = 1.0, seed: int = 0,
+                 dump_dir: str = None, raise_on_violation: bool = True):
+        self.battle_rate = battle_rate
+        self.turn_rate = turn_rate
+        self.dump_dir = dump_dir
+        self.raise_on_violation = raise_on_violation
+        self.active = False
+        self.violations: List[dict] = []
+        self._rng = random.Random(seed)
+        self._battle = None
+        self._reproducer = {}
+        self._skill_state = None
+
+    def attach(self, battle: 'Battle', **reproducer) -> bool:
+        if self._rng.random() >= self.battle_rate:
+            return False
+
+        self._battle = battle
+        self._reproducer = reproducer
+        battle.invariant_checker = self
+        for char in battle.party + [battle.boss]:
+            char.invariant_checker = self
+        return True
+
+    def begin_turn(self, battle: 'Battle', actor: 'Character') -> bool:
+        self.active = self._rng.random() < self.turn_rate
+        if self.active and not actor.is_alive:
+            self._violation(f"Мертвый персонаж {actor.name} получил ход")
+        return self.active
+
+    def end_turn(self, battle: 'Battle'):
+        if not self.active:
+            return
+        self.active = False
+
+        for char in battle.party + [battle.boss]:
+            if char.hp > char.max_hp:
+                self._violation(f"HP {char.name} больше максимума: {char.hp}/{char.max_hp}")
+            if char.hp < 0:
+                self._violation(f"HP {char.name} отрицательное: {char.hp}")
+            if not (0 <= char.mp <= char.max_mp):
+                self._violation(f"MP {char.name} вне допустимых границ: {char.mp}/{char.max_mp}")
+
+    def on_damage(self, attacker: 'Character', target: 'Character'):
+        if not attacker.is_alive:
+            self._violation(f"Мертвый персонаж {attacker.name} наносит урон {target.name}")
+
+    def before_skill(self, caster: 'Character', skill: 'Skill'):
+        self._skill_state = (caster.is_alive, skill.current_cooldown, caster.mp)
+
+    def on_skill(self, caster: 'Character', skill: 'Skill'):
+        alive, cooldown, mp = self._skill_state
+        self._skill_state = None
+        if not alive:
+            self._violation(f"Мертвый персонаж {caster.name} использует {skill.name}")
+        if cooldown > 0:
+            self._violation(f"Навык {skill.name} использован на перезарядке ({cooldown})")
+        if mp < skill.mp_cost:
+            self._violation(f"{caster.name} использует {skill.name} без MP: {mp} < {skill.mp_cost}")
+
+    def _violation(self, message: str):
+        battle = self._battle
+        record = dict(self._reproducer)
+        record['round'] = battle.round_number if battle else None
+        record['violation'] = message
+        self.violations.append(record)
+
+        if self.dump_dir is not None:
+            os.makedirs(self.dump_dir, exist_ok=True)
+            filename = os.path.join(self.dump_dir, f"violation_{record.get('seed')}_{record['round']}.json")
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(record, f, ensure_ascii=False)
+
+        if self.raise_on_violation:
+            raise InvariantViolation(message)
@@ -1,5 +1,8 @@
 from typing import TYPE_CHECKING, List
 
+from pool import POOLS
+from skills import BuffEffect
+
 if TYPE_CHECKING:
     from core import Character
 
@@ -23,6 +26,11 @@ class HealthPotion(Item):
         super().__init__("Зелье здоровья", f"Восстанавливает {heal_amount} HP")
         self.heal_amount = heal_amount
 
+    def reset(self, heal_amount: int = 30):
+        if heal_amount != self.heal_amount:
+            self.description = f"Восстанавливает {heal_amount} HP"
+            self.heal_amount = heal_amount
+
     def use(self, target: 'Character') -> str:
         if not target.is_alive:
             return f"{target.name} мертв, зелье не действует!"
@@ -39,6 +47,11 @@ class ManaPotion(Item):
         super().__init__("Зелье маны", f"Восстанавливает {mana_amount} MP")
         self.mana_amount = mana_amount
 
+    def reset(self, mana_amount: int = 30):
+        if mana_amount != self.mana_amount:
+            self.description = f"Восстанавливает {mana_amount} MP"
+            self.mana_amount = mana_amount
+
     def use(self, target: 'Character') -> str:
         old_mp = target.mp
         target.mp = min(target.max_mp, target.mp + self.mana_amount)
@@ -51,6 +64,9 @@ class Elixir(Item):
     def __init__(self):
         super().__init__("Эликсир", "Полностью восстанавливает HP и MP")
 
+    def reset(self):
+        pass
+
     def use(self, target: 'Character') -> str:
         if not target.is_alive:
             return f"{target.name} мертв, эликсир не действует!"
@@ -64,13 +80,39 @@ class Elixir(Item):
         return f"{target.name} использует {self.name}! Восстановлено: {hp_healed} HP, {mp_restored} MP"
 
 
+class BuffPotion(Item):
+
+    STAT_NAMES = {'strength': "силы", 'agility': "ловкости", 'intellect': "интеллекта"}
+
+    def __init__(self, stat: str = 'strength', add: float = 5, mult: float = 1.0, duration: int = 3):
+        super().__init__(f"Зелье {self.STAT_NAMES.get(stat, stat)}",
+                         f"Усиливает {stat} на {add} и x{mult} на {duration} хода")
+        self.stat = stat
+        self.add = add
+        self.mult = mult
+        self.duration = duration
+
+    def reset(self, stat: str = 'strength', add: float = 5, mult: float = 1.0, duration: int = 3):
+        if (stat, add, mult, duration) != (self.stat, self.add, self.mult, self.duration):
+            self.__init__(stat, add, mult, duration)
+
+    def use(self, target: 'Character') -> str:
+        if not target.is_alive:
+            return f"{target.name} мертв, зелье не действует!"
+
+        target.add_effect(POOLS.acquire(BuffEffect, self.stat, self.add, self.mult, self.duration))
+        return f"{target.name} использует {self.name}!"
+
+
 class Inventory:
 
     def __init__(self):
         self._items: List[Item] = []
+        self.dirty = False
 
     def add_item(self, item: Item):
         self._items.append(item)
+        self.dirty = True
 
     def use_item(self, item_index: int, target: 'Character') -> str:
         if item_index < 0 or item_index >= len(self._items):
@@ -79,11 +121,23 @@ class Inventory:
         item = self._items[item_index]
         result = item.use(target)
         self._items.pop(item_index)
+        POOLS.release(item)
+        self.dirty = True
         return result
 
+    def clear(self):
+        for item in self._items:
+            POOLS.release(item)
+        self._items.clear()
+        self.dirty = True
+
     def get_items_list(self) -> List[str]:
         return [f"{i}: {item}" for i, item in enumerate(self._items)]
 
+    @property
+    def items(self) -> List[Item]:
+        return list(self._items)
+
     @property
     def items_count(self) -> int:
         return len(self._items)
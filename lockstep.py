@@ -0,0 +1,149 @@
+import contextlib
+import json
+import random
+import struct
+import zlib
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+
+from autosave import battle_state
+from battle import Battle, ACTION_ATTACK, ACTION_SKILL, ACTION_ITEM
+from boss import Boss
+from core import Character
+from simulation import Roster, build_party
+
+ACTION_CODES = {ACTION_ATTACK: 0, ACTION_SKILL: 1, ACTION_ITEM: 2}
+ACTIONS_BY_CODE = {code: action for action, code in ACTION_CODES.items()}
+
+INPUT_PACKET = struct.Struct('<HBBI')
+
+
+class DesyncError(RuntimeError):
+    pass
+
+
+def encode_input(round_number: int, member: int, action: str, checksum: int) -> bytes:
+    return INPUT_PACKET.pack(round_number, member, ACTION_CODES[action], checksum)
+
+
+def decode_input(packet: bytes) -> tuple:
+    round_number, member, code, checksum = INPUT_PACKET.unpack(packet)
+    return round_number, member, ACTIONS_BY_CODE[code], checksum
+
+
+def state_checksum(battle: Battle) -> int:
+    state = json.dumps(battle_state(battle), sort_keys=True, separators=(',', ':'))
+    return zlib.crc32(state.encode())
+
+
+class LockstepBattle(Battle):
+
+    def __init__(self, party: List[Character], boss: Character):
+        super().__init__(party, boss)
+        self._inputs: Dict[int, str] = {}
+
+    def set_inputs(self, inputs: Dict[int, str]):
+        self._inputs = inputs
+
+    def _choose_action(self, character: Character) -> str:
+        member = self.party.index(character)
+        if member not in self._inputs:
+            return super()._choose_action(character)
+
+        action = self._inputs[member]
+        if action == ACTION_SKILL and character.mp <= 10:
+            return ACTION_ITEM
+        return action
+
+
+class LoopbackRelay:
+
+    def __init__(self, players: int):
+        self.players = players
+        self.bytes_relayed = 0
+        self._packets: Dict[int, Dict[int, bytes]] = defaultdict(dict)
+
+    def send(self, player_id: int, packet: bytes):
+        round_number = INPUT_PACKET.unpack(packet)[0]
+        self._packets[round_number][player_id] = packet
+        self.bytes_relayed += len(packet)
+
+    def receive(self, round_number: int) -> Optional[List[bytes]]:
+        packets = self._packets.get(round_number)
+        if packets is None or len(packets) < self.players:
+            return None
+
+        checksums = {decode_input(packet)[3] for packet in packets.values()}
+        if len(checksums) > 1:
+            raise DesyncError(f"Рассинхронизация в раунде {round_number}")
+
+        bundle = [packets[player_id] for player_id in sorted(packets)]
+        self.bytes_relayed += sum(len(packet) for packet in bundle)
+        return bundle
+
+    def release(self, round_number: int):
+        self._packets.pop(round_number, None)
+
+
+class LockstepClient:
+
+    def __init__(self, relay: LoopbackRelay, player_id: int, member: int,
+                 seed: int, roster: Roster, boss_level: int):
+        self.relay = relay
+        self.player_id = player_id
+        self.member = member
+
+        with self._isolated_random(random.Random(seed).getstate()):
+            self.battle = LockstepBattle(build_party(roster), Boss("Босс", level=boss_level))
+
+        self.outcome: Optional[bool] = None
+
+    @contextlib.contextmanager
+    def _isolated_random(self, state: tuple = None):
+        outer = random.getstate()
+        random.setstate(state if state is not None else self._rng_state)
+        try:
+            yield
+        finally:
+            self._rng_state = random.getstate()
+            random.setstate(outer)
+
+    @property
+    def finished(self) -> bool:
+        return self.outcome is not None or self.battle.is_finished
+
+    def submit(self, action: str):
+        packet = encode_input(self.battle.round_number + 1, self.member, action,
+                              state_checksum(self.battle))
+        self.relay.send(self.player_id, packet)
+
+    def step(self) -> bool:
+        bundle = self.relay.receive(self.battle.round_number + 1)
+        if bundle is None:
+            return False
+
+        inputs = {}
+        for packet in bundle:
+            _, member, action, _ = decode_input(packet)
+            inputs[member] = action
+        self.battle.set_inputs(inputs)
+
+        with self._isolated_random(), contextlib.redirect_stdout(None):
+            self.outcome = self.battle.play_round()
+        return True
+
+
+def run_loopback(seed: int, roster: Roster, boss_level: int,
+                 policy: Callable[[Battle, int], str]) -> List[LockstepClient]:
+    relay = LoopbackRelay(len(roster))
+    clients = [LockstepClient(relay, player_id, player_id, seed, roster, boss_level)
+               for player_id in range(len(roster))]
+
+    while not all(client.finished for client in clients):
+        for client in clients:
+            client.submit(policy(client.battle, client.member))
+        for client in clients:
+            client.step()
+        relay.release(clients[0].battle.round_number)
+
+    return clients
@@ -1,8 +1,14 @@
 #!/usr/bin/env python3
 import random
+import uuid
 from characters import Warrior, Mage, Healer
 from boss import Boss
 from battle import Battle
+from save_store import SaveStore
+from matchmaking import Surrogate
+from autosave import AutosaveJournal
+
+AUTOSAVE_PATH = "autosave.journal"
 
 
 def choose_difficulty():
@@ -10,13 +16,29 @@ def choose_difficulty():
     print("1. Легкая (босс ур. 3)")
     print("2. Средняя (босс ур. 5)")
     print("3. Сложная (босс ур. 8)")
+    print("4. Подобрать по команде (50% побед)")
 
     while True:
-        choice = input("Ваш выбор (1-3): ").strip()
+        choice = input("Ваш выбор (1-4): ").strip()
         if choice in ['1', '2', '3']:
             levels = {'1': 3, '2': 5, '3': 8}
             return levels[choice]
-        print("Пожалуйста, введите 1, 2 или 3")
+        if choice == '4':
+            return None
+        print("Пожалуйста, введите 1, 2, 3 или 4")
+
+
+def match_boss_level(party):
+    try:
+        surrogate = Surrogate.load("surrogate.json")
+    except FileNotFoundError:
+        print("Таблица surrogate.json не найдена (python matchmaking.py build), босс ур. 5")
+        return 5
+
+    level = surrogate.recommend_boss_level(party, target_win_rate=0.5)
+    win_rate, rounds = surrogate.predict(party, level)
+    print(f"Подобран босс ур. {level}: шанс победы {win_rate:.0%}, около {rounds:.0f} раундов")
+    return level
 
 
 def create_party():
@@ -68,28 +90,51 @@ def show_party_status(party):
             print(f"   Эффекты: {', '.join(char.active_effects)}")
 
 
+def resume_battle():
+    battle = AutosaveJournal.load(AUTOSAVE_PATH)
+    if battle is None:
+        return None
+
+    print(f"Найден прерванный бой (раунд {battle.round_number}).")
+    choice = input("Продолжить его? (y/n): ").strip().lower()
+    return battle if choice in ['y', 'д'] else None
+
+
 def main():
     print("ДОБРО ПОЖАЛОВАТЬ В ПАТИ ПРОТИВ БОССА!")
 
-    random_seed = input("Введите seed для случайной генерации (или Enter для случайного): ").strip()
-    if random_seed:
-        random.seed(random_seed)
-        print(f"Используется seed: {random_seed}")
+    random_seed = ""
+    battle = resume_battle()
+
+    if battle is None:
+        random_seed = input("Введите seed для случайной генерации (или Enter для случайного): ").strip()
+        if random_seed:
+            random.seed(random_seed)
+            print(f"Используется seed: {random_seed}")
 
-    difficulty = choose_difficulty()
-    party = create_party()
+        difficulty = choose_difficulty()
+        party = create_party()
+        if difficulty is None:
+            difficulty = match_boss_level(party)
 
-    boss_names = ["Дракон Гиммелут", "Демон Капучин", "Сфинктерион"]
-    boss_name = random.choice(boss_names)
-    boss = Boss(boss_name, level=difficulty)
+        boss_names = ["Дракон Гиммелут", "Демон Капучин", "Сфинктерион"]
+        boss_name = random.choice(boss_names)
+        boss = Boss(boss_name, level=difficulty)
+
+        battle = Battle(party, boss)
+    else:
+        party = battle.party
+        boss = battle.boss
 
     print(f"\nВАШ ПРОТИВНИК: {boss}")
 
-    battle = Battle(party, boss)
+    journal = AutosaveJournal(AUTOSAVE_PATH)
+    journal.attach(battle)
 
     input("\nНажмите Enter чтобы начать бой...")
 
     victory = battle.start()
+    journal.close(remove=True)
 
     print("\n")
     if victory:
@@ -110,7 +155,11 @@ def main():
 
     print(f"\nПолный лог боя сохранен в: {log_filename}")
 
-    battle.save_state("battle_state.json")
+    session = uuid.uuid4().hex
+    with SaveStore("saves.db") as store:
+        store.save(battle, player="local", session=session)
+
+    print(f"Состояние боя сохранено в saves.db (сессия {session})")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+import argparse
+import itertools
+import json
+import multiprocessing
+import time
+from typing import Dict, List, Sequence, Tuple
+
+from core import Character
+from simulation import CHARACTER_CLASSES, run_battle, release_battle, worker_pool
+
+PARTY_SIZE = 3
+LEVELS = range(1, 11)
+BOSS_LEVELS = range(1, 11)
+HELD_OUT_SEED_OFFSET = 1_000_000
+
+
+def compositions(party_size: int = PARTY_SIZE) -> List[Tuple[str, ...]]:
+    return list(itertools.combinations_with_replacement(sorted(CHARACTER_CLASSES), party_size))
+
+
+def cell_key(composition: Sequence[str], level: int, boss_level: int) -> str:
+    return f"{','.join(sorted(composition))}|{level}|{boss_level}"
+
+
+def _simulate_cell(args) -> Tuple[str, float, float]:
+    composition, level, boss_level, battles, seed_offset = args
+    roster = [(class_name, level) for class_name in composition]
+
+    wins = 0
+    rounds = 0
+    for seed in range(seed_offset, seed_offset + battles):
+        battle, victory = run_battle(roster, boss_level, seed)
+        wins += int(victory)
+        rounds += battle.round_number
+        release_battle(battle)
+
+    return cell_key(composition, level, boss_level), wins / battles, rounds / battles
+
+
+def simulate_cells(battles: int, levels: Sequence[int] = LEVELS, boss_levels: Sequence[int] = BOSS_LEVELS,
+                   seed_offset: int = 0, workers: int = None) -> Dict[str, List[float]]:
+    tasks = [(composition, level, boss_level, battles, seed_offset)
+             for composition in compositions()
+             for level in levels
+             for boss_level in boss_levels]
+
+    with worker_pool(workers or multiprocessing.cpu_count()) as pool:
+        return {key: [win_rate, rounds]
+                for key, win_rate, rounds in pool.imap_unordered(_simulate_cell, tasks, chunksize=4)}
+
+
+class Surrogate:
+
+    def __init__(self, table: dict):
+        self.meta = table['meta']
+        self._cells: Dict[str, List[float]] = table['cells']
+        self._levels = self.meta['levels']
+        self._boss_levels = self.meta['boss_levels']
+
+    @classmethod
+    def build(cls, battles: int, levels: Sequence[int] = LEVELS, boss_levels: Sequence[int] = BOSS_LEVELS,
+              workers: int = None) -> 'Surrogate':
+        return cls({
+            'meta': {
+                'battles': battles,
+                'levels': list(levels),
+                'boss_levels': list(boss_levels)
+            },
+            'cells': simulate_cells(battles, levels, boss_levels, workers=workers)
+        })
+
+    @classmethod
+    def load(cls, path: str) -> 'Surrogate':
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def save(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'meta': self.meta, 'cells': self._cells}, f, ensure_ascii=False)
+
+    @staticmethod
+    def _clamp(value: int, allowed: List[int]) -> int:
+        return min(max(value, allowed[0]), allowed[-1])
+
+    def predict(self, party: List[Character], boss_level: int) -> Tuple[float, float]:
+        composition = [char.__class__.__name__ for char in party]
+        level = round(sum(char.level for char in party) / len(party))
+        return self.predict_roster(composition, level, boss_level)
+
+    def predict_roster(self, composition: Sequence[str], level: int, boss_level: int) -> Tuple[float, float]:
+        key = cell_key(composition, self._clamp(level, self._levels), self._clamp(boss_level, self._boss_levels))
+        if key not in self._cells:
+            raise KeyError(f"Нет данных для состава {key}")
+        win_rate, rounds = self._cells[key]
+        return win_rate, rounds
+
+    def recommend_boss_level(self, party: List[Character], target_win_rate: float = 0.5) -> int:
+        return min(self._boss_levels,
+                   key=lambda boss_level: abs(self.predict(party, boss_level)[0] - target_win_rate))
+
+    def evaluate(self, battles: int, workers: int = None) -> Dict[str, float]:
+        held_out = simulate_cells(battles, self._levels, self._boss_levels,
+                                  seed_offset=HELD_OUT_SEED_OFFSET, workers=workers)
+        win_errors = [abs(self._cells[key][0] - actual[0]) for key, actual in held_out.items()]
+        round_errors = [abs(self._cells[key][1] - actual[1]) for key, actual in held_out.items()]
+        return {
+            'cells': len(held_out),
+            'win_rate_mae': sum(win_errors) / len(win_errors),
+            'win_rate_max_error': max(win_errors),
+            'rounds_mae': sum(round_errors) / len(round_errors)
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Таблица прогноза исхода боя для подбора босса")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="Пересчитать таблицу симуляцией")
+    build_parser.add_argument("--battles", type=int, default=200)
+    build_parser.add_argument("--out", default="surrogate.json")
+    build_parser.add_argument("--workers", type=int, default=None)
+
+    evaluate_parser = subparsers.add_parser("evaluate", help="Сравнить таблицу с отложенными симуляциями")
+    evaluate_parser.add_argument("--table", default="surrogate.json")
+    evaluate_parser.add_argument("--battles", type=int, default=100)
+    evaluate_parser.add_argument("--workers", type=int, default=None)
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        started = time.perf_counter()
+        surrogate = Surrogate.build(args.battles, workers=args.workers)
+        surrogate.save(args.out)
+        print(f"Таблица из {len(surrogate._cells)} ячеек сохранена в {args.out} "
+              f"за {time.perf_counter() - started:.1f} c")
+    else:
+        surrogate = Surrogate.load(args.table)
+        report = surrogate.evaluate(args.battles, workers=args.workers)
+        print(f"Ячеек: {report['cells']}")
+        print(f"Средняя ошибка вероятности победы: {report['win_rate_mae']:.3f} "
+              f"(максимум {report['win_rate_max_error']:.3f})")
+        print(f"Средняя ошибка числа раундов: {report['rounds_mae']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
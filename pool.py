@@ -0,0 +1,78 @@
+import gc
+import weakref
+from typing import Any, Callable, Dict, List
+
+
+class ObjectPool:
+
+    def __init__(self, factory: Callable[..., Any], max_size: int = 1024):
+        self.factory = factory
+        self.max_size = max_size
+        self.created = 0
+        self.reused = 0
+        self._free: List[Any] = []
+        self._leased = weakref.WeakSet()
+
+    def acquire(self, *args, **kwargs) -> Any:
+        if self._free:
+            obj = self._free.pop()
+            obj.reset(*args, **kwargs)
+            self.reused += 1
+        else:
+            obj = self.factory(*args, **kwargs)
+            self.created += 1
+        self._leased.add(obj)
+        return obj
+
+    def release(self, obj: Any):
+        if obj not in self._leased:
+            return
+        self._leased.discard(obj)
+        if len(self._free) < self.max_size:
+            self._free.append(obj)
+
+    @property
+    def free_count(self) -> int:
+        return len(self._free)
+
+    def clear(self):
+        self._free.clear()
+
+
+class PoolRegistry:
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self.enabled = True
+        self._pools: Dict[type, ObjectPool] = {}
+
+    def pool(self, cls: type) -> ObjectPool:
+        pool = self._pools.get(cls)
+        if pool is None:
+            pool = self._pools[cls] = ObjectPool(cls, self.max_size)
+        return pool
+
+    def acquire(self, cls: type, *args, **kwargs) -> Any:
+        if not self.enabled:
+            return cls(*args, **kwargs)
+        return self.pool(cls).acquire(*args, **kwargs)
+
+    def release(self, obj: Any):
+        if self.enabled:
+            self.pool(type(obj)).release(obj)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {cls.__name__: {'created': pool.created, 'reused': pool.reused, 'free': pool.free_count}
+                for cls, pool in self._pools.items()}
+
+    def clear(self):
+        for pool in self._pools.values():
+            pool.clear()
+
+
+POOLS = PoolRegistry()
+
+
+def freeze_static():
+    gc.collect()
+    gc.freeze()
@@ -0,0 +1,122 @@
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+from battle import Battle
+
+
+class SaveStore:
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS saves (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            player TEXT NOT NULL,
+            session TEXT NOT NULL,
+            slot TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            round_number INTEGER NOT NULL,
+            state TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_saves_session ON saves (session, created_at);
+        CREATE INDEX IF NOT EXISTS idx_saves_player_slot ON saves (player, slot, created_at);
+        CREATE INDEX IF NOT EXISTS idx_saves_created ON saves (created_at);
+    """
+
+    def __init__(self, path: str = "saves.db", batch_size: int = 256):
+        self.path = path
+        self.batch_size = batch_size
+        self._pending = []
+        self._batch_depth = 0
+
+        self._conn = sqlite3.connect(path)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self._SCHEMA)
+
+    def save(self, battle: Battle, player: str, session: str, slot: str = "auto"):
+        state = battle.get_state()
+        self._pending.append((
+            player,
+            session,
+            slot,
+            time.time(),
+            state['round_number'],
+            json.dumps(state, ensure_ascii=False, separators=(',', ':'))
+        ))
+
+        if self._batch_depth == 0 and len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO saves (player, session, slot, created_at, round_number, state) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                self._pending
+            )
+        self._pending.clear()
+
+    @contextmanager
+    def batch(self) -> Iterator['SaveStore']:
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.flush()
+
+    def latest_for_session(self, session: str) -> Optional[dict]:
+        self.flush()
+        row = self._conn.execute(
+            "SELECT state FROM saves WHERE session = ? ORDER BY created_at DESC, id DESC LIMIT 1",
+            (session,)
+        ).fetchone()
+        return json.loads(row['state']) if row else None
+
+    def latest_for_player(self, player: str, slot: str = "auto") -> Optional[dict]:
+        self.flush()
+        row = self._conn.execute(
+            "SELECT state FROM saves WHERE player = ? AND slot = ? "
+            "ORDER BY created_at DESC, id DESC LIMIT 1",
+            (player, slot)
+        ).fetchone()
+        return json.loads(row['state']) if row else None
+
+    def history(self, player: str, slot: str = "auto", limit: int = 20) -> List[dict]:
+        self.flush()
+        rows = self._conn.execute(
+            "SELECT session, created_at, round_number, state FROM saves "
+            "WHERE player = ? AND slot = ? ORDER BY created_at DESC, id DESC LIMIT ?",
+            (player, slot, limit)
+        ).fetchall()
+        return [{
+            'session': row['session'],
+            'created_at': row['created_at'],
+            'round_number': row['round_number'],
+            'state': json.loads(row['state'])
+        } for row in rows]
+
+    def slots(self, player: str) -> List[str]:
+        self.flush()
+        rows = self._conn.execute(
+            "SELECT DISTINCT slot FROM saves WHERE player = ? ORDER BY slot",
+            (player,)
+        ).fetchall()
+        return [row['slot'] for row in rows]
+
+    def close(self):
+        self.flush()
+        self._conn.close()
+
+    def __enter__(self) -> 'SaveStore':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,174 @@
+import contextlib
+import multiprocessing
+import multiprocessing.pool
+import random
+import weakref
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Sequence, Tuple
+
+from battle import Battle
+from boss import Boss
+from characters import Warrior, Mage, Healer
+from core import Character
+from damage import is_fixed_point, set_fixed_point
+from invariants import InvariantChecker
+from pool import POOLS
+
+CHARACTER_CLASSES = {
+    'Warrior': Warrior,
+    'Mage': Mage,
+    'Healer': Healer
+}
+
+Roster = Sequence[Tuple[str, int]]
+
+
+def build_party(roster: Roster) -> List[Character]:
+    party = []
+    for i, (class_name, level) in enumerate(roster):
+        if class_name not in CHARACTER_CLASSES:
+            raise ValueError(f"Неизвестный класс персонажа: {class_name}")
+        party.append(POOLS.acquire(CHARACTER_CLASSES[class_name], f"{class_name}{i + 1}", level))
+    return party
+
+
+def release_battle(battle: Battle):
+    for char in battle.party + [battle.boss]:
+        POOLS.release(char)
+
+
+def worker_pool(processes: int, context: multiprocessing.context.BaseContext = None) -> multiprocessing.pool.Pool:
+    return (context or multiprocessing).Pool(processes, initializer=set_fixed_point,
+                                              initargs=(is_fixed_point(),))
+
+
+def run_battle(roster: Roster, boss_level: int, seed: int,
+               checker: InvariantChecker = None) -> Tuple[Battle, bool]:
+    random.seed(seed)
+    party = build_party(roster)
+    boss = POOLS.acquire(Boss, "Босс", level=boss_level)
+    battle = Battle(party, boss)
+
+    if checker is not None:
+        checker.attach(battle, seed=seed, roster=[list(member) for member in roster], boss_level=boss_level)
+
+    with contextlib.redirect_stdout(None):
+        victory = battle.start()
+
+    return battle, victory
+
+
+class ResultBuffer:
+
+    FIELDS = ('seed', 'victory', 'rounds', 'boss_hp', 'boss_damage', 'party_damage')
+
+    def __init__(self, capacity: int, party_size: int, name: str = None):
+        self.capacity = capacity
+        self.party_size = party_size
+        self.width = len(self.FIELDS) + party_size
+
+        if name is None:
+            self._shm = SharedMemory(create=True, size=max(1, capacity * self.width * 8))
+            self._owner = True
+        else:
+            self._shm = SharedMemory(name=name)
+            self._owner = False
+
+        self._view = self._shm.buf.cast('d')
+        self._exports = weakref.WeakValueDictionary()
+
+    def _export(self, view: memoryview) -> memoryview:
+        self._exports[id(view)] = view
+        return view
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def write(self, index: int, seed: int, battle: Battle, victory: bool):
+        offset = index * self.width
+        view = self._view
+
+        view[offset] = seed
+        view[offset + 1] = 1.0 if victory else 0.0
+        view[offset + 2] = battle.round_number
+        view[offset + 3] = battle.boss.hp
+        view[offset + 4] = battle.boss.damage_taken
+        view[offset + 5] = sum(char.damage_taken for char in battle.party)
+
+        offset += len(self.FIELDS)
+        for i, char in enumerate(battle.party):
+            view[offset + i] = char.hp
+
+    def record(self, index: int) -> memoryview:
+        offset = index * self.width
+        return self._export(self._view[offset:offset + self.width])
+
+    def column(self, field: str) -> memoryview:
+        return self._export(self._view[self.FIELDS.index(field):self.capacity * self.width:self.width])
+
+    def party_hp(self, member: int) -> memoryview:
+        start = len(self.FIELDS) + member
+        return self._export(self._view[start:self.capacity * self.width:self.width])
+
+    def summary(self) -> Dict[str, float]:
+        if self.capacity == 0:
+            return {'battles': 0, 'win_rate': 0.0, 'avg_rounds': 0.0,
+                    'avg_boss_damage': 0.0, 'avg_party_damage': 0.0}
+
+        return {
+            'battles': self.capacity,
+            'win_rate': sum(self.column('victory')) / self.capacity,
+            'avg_rounds': sum(self.column('rounds')) / self.capacity,
+            'avg_boss_damage': sum(self.column('boss_damage')) / self.capacity,
+            'avg_party_damage': sum(self.column('party_damage')) / self.capacity
+        }
+
+    def close(self):
+        try:
+            for view in list(self._exports.values()):
+                view.release()
+            self._view.release()
+            self._shm.close()
+        finally:
+            if self._owner:
+                self._shm.unlink()
+
+    def __enter__(self) -> 'ResultBuffer':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _simulate_slice(args) -> int:
+    name, capacity, roster, boss_level, start, seeds = args
+    buffer = ResultBuffer(capacity, len(roster), name=name)
+    try:
+        for offset, seed in enumerate(seeds):
+            battle, victory = run_battle(roster, boss_level, seed)
+            buffer.write(start + offset, seed, battle, victory)
+            release_battle(battle)
+    finally:
+        buffer.close()
+    return len(seeds)
+
+
+def simulate_parallel(roster: Roster, boss_level: int, seeds: range, workers: int = None) -> ResultBuffer:
+    workers = workers or multiprocessing.cpu_count()
+    buffer = ResultBuffer(len(seeds), len(roster))
+
+    slice_size = -(-len(seeds) // workers) if seeds else 0
+    tasks = []
+    for start in range(0, len(seeds), slice_size or 1):
+        tasks.append((buffer.name, buffer.capacity, list(roster), boss_level,
+                      start, seeds[start:start + slice_size]))
+
+    try:
+        with worker_pool(min(workers, len(tasks)) or 1) as pool:
+            pool.map(_simulate_slice, tasks)
+    except BaseException:
+        buffer.close()
+        raise
+
+    return buffer
@@ -1,12 +1,17 @@
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING
 
+from core import StatModifier
+from damage import DamageModifier, scale
+
 if TYPE_CHECKING:
     from core import Character
 
 
 class Effect(ABC):
 
+    STATE_FIELDS = ('current_duration',)
+
     def __init__(self, name: str, duration: int = 3):
         self.name = name
         self.duration = duration
@@ -20,6 +25,9 @@ class Effect(ABC):
     def on_turn(self, target: 'Character') -> str:
         pass
 
+    def on_remove(self, target: 'Character'):
+        pass
+
     def is_expired(self) -> bool:
         self.current_duration -= 1
         return self.current_duration <= 0
@@ -31,6 +39,10 @@ class PoisonEffect(Effect):
         super().__init__("Отравление", 3)
         self.damage_per_turn = damage_per_turn
 
+    def reset(self, damage_per_turn: int = 5):
+        self.current_duration = self.duration
+        self.damage_per_turn = damage_per_turn
+
     def on_apply(self, target: 'Character'):
         return f"{target.name} отравлен!"
 
@@ -39,13 +51,21 @@ class PoisonEffect(Effect):
         return f"{target.name} получает {self.damage_per_turn} урона от яда"
 
 
-class ShieldEffect(Effect):
+class ShieldEffect(Effect, DamageModifier):
+
+    order = 20
+    STATE_FIELDS = ('current_duration', 'remaining_shield')
 
     def __init__(self, shield_strength: float = 20):
         super().__init__("Щит", 2)
         self.shield_strength = shield_strength
         self.remaining_shield = shield_strength
 
+    def reset(self, shield_strength: float = 20):
+        self.current_duration = self.duration
+        self.shield_strength = shield_strength
+        self.remaining_shield = shield_strength
+
     def on_apply(self, target: 'Character'):
         return f"{target.name} получает щит!"
 
@@ -61,6 +81,9 @@ class ShieldEffect(Effect):
             self.remaining_shield = 0
             return remaining_damage
 
+    def modify(self, damage: float) -> float:
+        return self.absorb_damage(damage)
+
 
 class RegenerationEffect(Effect):
 
@@ -68,6 +91,10 @@ class RegenerationEffect(Effect):
         super().__init__("Регенерация", 3)
         self.heal_per_turn = heal_per_turn
 
+    def reset(self, heal_per_turn: int = 10):
+        self.current_duration = self.duration
+        self.heal_per_turn = heal_per_turn
+
     def on_apply(self, target: 'Character'):
         return f"{target.name} начинает regenerировать!"
 
@@ -76,6 +103,29 @@ class RegenerationEffect(Effect):
         return f"{target.name} восстанавливает {self.heal_per_turn} HP"
 
 
+class BuffEffect(Effect, StatModifier):
+
+    def __init__(self, stat: str, add: float = 0, mult: float = 1.0, duration: int = 3):
+        Effect.__init__(self, "Усиление" if add >= 0 and mult >= 1 else "Ослабление", duration)
+        StatModifier.__init__(self, stat, add, mult)
+
+    def reset(self, stat: str, add: float = 0, mult: float = 1.0, duration: int = 3):
+        self.name = "Усиление" if add >= 0 and mult >= 1 else "Ослабление"
+        self.duration = duration
+        self.current_duration = duration
+        StatModifier.__init__(self, stat, add, mult)
+
+    def on_apply(self, target: 'Character'):
+        target.add_stat_modifier(self)
+        return f"{target.name}: {self.name} ({self.stat})!"
+
+    def on_remove(self, target: 'Character'):
+        target.remove_stat_modifier(self)
+
+    def on_turn(self, target: 'Character') -> str:
+        return f"{self.name} {self.stat} у {target.name} ({self.current_duration} ход.)"
+
+
 class Skill:
 
     def __init__(self, name: str, mp_cost: float = 0, cooldown: int = 0, target_type: str = "ally"):
@@ -97,17 +147,29 @@ class Skill:
         return True
 
     def use(self, caster: 'Character', target: 'Character') -> str:
+        checker = caster.invariant_checker
+        checking = checker is not None and checker.active
+        if checking:
+            checker.before_skill(caster, self)
+
         if not self.can_use(caster, target):
             return f"Навык {self.name} недоступен!"
 
+        if checking:
+            checker.on_skill(caster, self)
+
         caster.mp -= self.mp_cost
         self.current_cooldown = self.cooldown
+        caster.dirty_fields.add('cooldowns')
         return self._apply_effect(caster, target)
 
     @abstractmethod
     def _apply_effect(self, caster: 'Character', target: 'Character') -> str:
         pass
 
+    def reset(self):
+        self.current_cooldown = 0
+
     def reduce_cooldown(self):
         if self.current_cooldown > 0:
             self.current_cooldown -= 1
@@ -119,7 +181,7 @@ class FireballSkill(Skill):
         super().__init__("Огненный шар", mp_cost=15, cooldown=2, target_type="enemy")
 
     def _apply_effect(self, caster: 'Character', target: 'Character') -> str:
-        damage = caster.intellect * 1.5
+        damage = scale(caster.intellect, 1.5)
         target.take_damage(damage)
         return f"{caster.name} использует Огненный шар! {target.name} получает {damage} урона"
 
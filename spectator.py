@@ -0,0 +1,143 @@
+import sys
+import threading
+import time
+from typing import Callable, List, TextIO, Tuple
+
+from battle import Battle
+from core import Character
+
+
+class Spectator:
+
+    def __init__(self, stream: TextIO = None, fps: float = 10.0, bar_width: int = 20,
+                 clock: Callable[[], float] = time.monotonic):
+        self.stream = stream or sys.stdout
+        self.min_interval = 1.0 / fps
+        self.bar_width = bar_width
+        self._clock = clock
+        self._battles: List[Battle] = []
+        self._previous: List[str] = []
+        self._last_draw = None
+        self._lock = threading.Lock()
+        self._dirty = threading.Event()
+
+    def watch(self, battle: Battle):
+        self._battles.append(battle)
+        battle.add_listener(self._on_event)
+
+    def unwatch(self, battle: Battle):
+        if battle in self._battles:
+            self._battles.remove(battle)
+            battle.remove_listener(self._on_event)
+
+    def _on_event(self, battle: Battle, message: str):
+        self._dirty.set()
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty.is_set()
+
+    def refresh(self, force: bool = False) -> bool:
+        now = self._clock()
+        if not force and self._last_draw is not None and now - self._last_draw < self.min_interval:
+            return False
+
+        with self._lock:
+            self._last_draw = now
+            self._draw(self.render())
+        return True
+
+    def run(self, stop: threading.Event):
+        while not stop.wait(self.min_interval):
+            if self._dirty.is_set():
+                self._dirty.clear()
+                self.refresh(force=True)
+        self._dirty.clear()
+        self.refresh(force=True)
+
+    def start(self) -> Tuple[threading.Thread, threading.Event]:
+        stop = threading.Event()
+        thread = threading.Thread(target=self.run, args=(stop,), daemon=True)
+        thread.start()
+        return thread, stop
+
+    def render(self) -> List[str]:
+        lines = []
+        for number, battle in enumerate(self._battles, 1):
+            lines.append(f"Бой {number} | Раунд {battle.round_number}")
+            lines.append(self._render_character(battle.boss))
+            for char in battle.party:
+                lines.append(self._render_character(char))
+            lines.append("Порядок ходов: " + " > ".join(battle.turn_order.get_current_order()))
+            lines.append("")
+        return lines
+
+    def _render_character(self, char: Character) -> str:
+        line = (f"  {char.name:<16} {self._bar(char.hp, char.max_hp)} HP {char.hp:>6.1f}/{char.max_hp:<4} "
+                f"{self._bar(char.mp, char.max_mp)} MP {char.mp:>5.1f}/{char.max_mp:<4}")
+
+        if not char.is_alive:
+            return line + " МЕРТВ"
+
+        if char.active_effects:
+            line += " Эффекты: " + ", ".join(char.active_effects)
+
+        cooldowns = [f"{skill.name} {skill.current_cooldown}"
+                     for skill in getattr(char, 'skills', []) if skill.current_cooldown > 0]
+        if cooldowns:
+            line += " КД: " + ", ".join(cooldowns)
+
+        return line
+
+    def _bar(self, value: float, maximum: float) -> str:
+        filled = round(self.bar_width * value / maximum) if maximum else 0
+        filled = max(0, min(self.bar_width, filled))
+        return "[" + "#" * filled + "-" * (self.bar_width - filled) + "]"
+
+    def _draw(self, lines: List[str]):
+        output = []
+        if not self._previous:
+            output.append("\x1b[2J")
+
+        for row, line in enumerate(lines):
+            old = self._previous[row] if row < len(self._previous) else None
+            if line == old:
+                continue
+
+            column = 0
+            if old is not None:
+                limit = min(len(line), len(old))
+                while column < limit and line[column] == old[column]:
+                    column += 1
+
+            output.append(f"\x1b[{row + 1};{column + 1}H{line[column:]}\x1b[K")
+
+        for row in range(len(lines), len(self._previous)):
+            output.append(f"\x1b[{row + 1};1H\x1b[K")
+
+        output.append(f"\x1b[{len(lines) + 1};1H")
+        self._previous = lines
+
+        self.stream.write("".join(output))
+        self.stream.flush()
+
+
+if __name__ == "__main__":
+    import contextlib
+    import random
+    from boss import Boss
+    from characters import Warrior, Mage, Healer
+
+    if len(sys.argv) > 1:
+        random.seed(sys.argv[1])
+
+    spectator = Spectator(fps=10.0)
+    battle = Battle([Warrior("Воин", 5), Mage("Маг", 5), Healer("Лекарь", 5)], Boss("Босс", 5))
+    spectator.watch(battle)
+    thread, stop = spectator.start()
+
+    with contextlib.redirect_stdout(None):
+        battle.start()
+
+    stop.set()
+    thread.join()
@@ -1,8 +1,32 @@
+import asyncio
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import random
+import tempfile
+import time
 import unittest
-from characters import Warrior, Mage, Healer
+
+from autosave import AutosaveJournal, battle_state, measure_overhead
+from battle import Battle, TurnOrder, ACTION_ATTACK, ACTION_SKILL
 from boss import Boss
-from items import HealthPotion, Inventory
-from skills import PoisonEffect, ShieldEffect
+from broadcast import Broadcaster, run_load_test, POLICY_LATEST
+from campaign import Campaign, CampaignRunner, run_unit
+from characters import Warrior, Mage, Healer
+from core import StatModifier
+from damage import scale, set_fixed_point, is_fixed_point
+from invariants import InvariantChecker, InvariantViolation
+from items import HealthPotion, Inventory, BuffPotion
+from lockstep import (LoopbackRelay, LockstepClient, DesyncError, run_loopback,
+                      state_checksum, INPUT_PACKET)
+from matchmaking import Surrogate, compositions
+from pool import ObjectPool, POOLS
+from save_store import SaveStore
+from simulation import run_battle, simulate_parallel, release_battle, worker_pool
+from skills import PoisonEffect, ShieldEffect, BuffEffect, PowerStrikeSkill
+from spectator import Spectator
 
 
 class TestGame(unittest.TestCase):
@@ -57,6 +81,35 @@ class TestGame(unittest.TestCase):
         self.assertEqual(absorbed_damage, 0)
         self.assertEqual(shield.remaining_shield, 5)
 
+    def test_shield_absorbs_incoming_damage(self):
+        self.warrior.add_effect(ShieldEffect(20))
+        initial_hp = self.warrior.hp
+
+        self.warrior.take_damage(15)
+        self.assertEqual(self.warrior.hp, initial_hp)
+
+        self.warrior.take_damage(15)
+        self.assertEqual(self.warrior.hp, initial_hp - 10)
+
+    def test_damage_chain_is_cached(self):
+        chain = self.warrior.damage_chain
+        self.assertIs(self.warrior.damage_chain, chain)
+
+        self.warrior.add_effect(PoisonEffect(5))
+        self.assertIs(self.warrior.damage_chain, chain)
+
+        self.warrior.add_effect(ShieldEffect(5))
+        self.assertIsNot(self.warrior.damage_chain, chain)
+
+    def test_resistance_reduces_damage(self):
+        self.boss.resistance = 0.5
+        initial_hp = self.boss.hp
+        self.boss.take_damage(40)
+        self.assertEqual(self.boss.hp, initial_hp - 20)
+
+        with self.assertRaises(ValueError):
+            self.boss.resistance = 2
+
     def test_inventory(self):
         inventory = Inventory()
         potion = HealthPotion()
@@ -88,6 +141,740 @@ class TestGame(unittest.TestCase):
         result = self.warrior.basic_attack(self.boss)
         self.assertIn("мертв", result.lower())
 
+    def test_boss_phase_changes_on_damage(self):
+        self.assertEqual(self.boss.phase, "phase1")
+        self.boss.take_damage(self.boss.max_hp * 0.5)
+        self.assertEqual(self.boss.phase, "phase2")
+        self.assertIn("phase2", self.boss.use_skill(self.warrior, 0))
+
+        self.boss.heal(self.boss.max_hp)
+        self.assertEqual(self.boss.phase, "phase1")
+
+    def test_boss_change_phase_is_lasting(self):
+        self.boss.change_phase("phase3")
+        self.boss.use_skill(self.warrior, 0)
+        self.boss.take_damage(1)
+        self.assertEqual(self.boss.phase, "phase3")
+        self.assertEqual(self.boss.change_phase("unknown"), "Неизвестная фаза")
+
+    def test_scripted_boss_phases(self):
+        boss = Boss("Скриптовый босс", 1, phases=[
+            {'name': 'calm', 'strategy': 'aggressive', 'hp_above': 0.5,
+             'timer': {'rounds': 2, 'next': 'enrage'}},
+            {'name': 'guard', 'strategy': 'debuff', 'hp_above': 0.0,
+             'on_enter': [('shield', 40)]},
+            {'name': 'enrage', 'strategy': 'aoe', 'hp_above': 0.0}
+        ])
+        boss.take_damage(boss.max_hp * 0.6)
+        self.assertEqual(boss.phase, "guard")
+        self.assertIn("Щит", boss.active_effects)
+
+        boss.change_phase("calm")
+        boss.process_effects()
+        boss.process_effects()
+        self.assertEqual(boss.phase, "enrage")
+
+        with self.assertRaises(ValueError):
+            Boss("Ошибка", 1, phases=[{'name': 'x', 'strategy': 'unknown'}])
+
+    def test_lethal_hit_does_not_enter_phase(self):
+        boss = Boss("Скриптовый босс", 1, phases=[
+            {'name': 'p1', 'strategy': 'aggressive', 'hp_above': 0.5},
+            {'name': 'last', 'strategy': 'aoe', 'hp_above': 0.0,
+             'on_enter': [('heal', 0.5)]}
+        ])
+        boss.take_damage(boss.max_hp)
+        self.assertFalse(boss.is_alive)
+        self.assertEqual(boss.hp, 0)
+        self.assertEqual(boss.phase, "p1")
+
+
+class TestSimulation(unittest.TestCase):
+
+    def setUp(self):
+        self.roster = [('Warrior', 3), ('Mage', 3), ('Healer', 3)]
+
+    def test_run_battle_is_deterministic(self):
+        first, first_victory = run_battle(self.roster, 3, 42)
+        second, second_victory = run_battle(self.roster, 3, 42)
+        self.assertEqual(first_victory, second_victory)
+        self.assertEqual(first.round_number, second.round_number)
+        self.assertEqual(first.boss.hp, second.boss.hp)
+
+    def test_parallel_results_match_sequential(self):
+        with simulate_parallel(self.roster, 3, range(10, 22), workers=3) as results:
+            battle, victory = run_battle(self.roster, 3, 15)
+            record = results.record(5)
+            self.assertEqual(record[0], 15)
+            self.assertEqual(record[1], 1.0 if victory else 0.0)
+            self.assertEqual(record[2], battle.round_number)
+            self.assertEqual(list(results.party_hp(0))[5], battle.party[0].hp)
+
+            summary = results.summary()
+            self.assertEqual(summary['battles'], 12)
+            self.assertTrue(0.0 <= summary['win_rate'] <= 1.0)
+
+        with self.assertRaises(ValueError):
+            record[0]
+
+
+class TestSaveStore(unittest.TestCase):
+
+    def setUp(self):
+        self.store = SaveStore(":memory:", batch_size=4)
+        self.battle, _ = run_battle([('Warrior', 2), ('Healer', 2)], 2, 7)
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_latest_for_session(self):
+        with self.store.batch():
+            for round_number in range(1, 6):
+                self.battle.round_number = round_number
+                self.store.save(self.battle, player="p1", session="s1")
+            self.battle.round_number = 99
+            self.store.save(self.battle, player="p1", session="s2")
+
+        self.assertEqual(self.store.latest_for_session("s1")['round_number'], 5)
+        self.assertEqual(self.store.latest_for_session("s2")['round_number'], 99)
+        self.assertIsNone(self.store.latest_for_session("missing"))
+
+    def test_slots_and_history(self):
+        self.store.save(self.battle, player="p1", session="s1", slot="auto")
+        self.store.save(self.battle, player="p1", session="s1", slot="manual")
+        self.store.save(self.battle, player="p2", session="s3")
+
+        self.assertEqual(self.store.slots("p1"), ["auto", "manual"])
+        history = self.store.history("p1", slot="manual")
+        self.assertEqual(len(history), 1)
+        self.assertEqual(history[0]['session'], "s1")
+        self.assertEqual(history[0]['state']['boss']['name'], self.battle.boss.name)
+
+
+class TestSpectator(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 0.0
+        self.stream = io.StringIO()
+        self.spectator = Spectator(self.stream, fps=10.0, clock=lambda: self.now)
+        self.battle = Battle([Warrior("Воин", 1)], Boss("Босс", 1))
+        self.spectator.watch(self.battle)
+
+    def test_render_shows_bars_and_turn_order(self):
+        frame = self.spectator.render()
+        self.assertIn("Бой 1 | Раунд 0", frame[0])
+        self.assertIn("[####################] HP", frame[1])
+        self.assertIn("Порядок ходов", frame[3])
+
+    def test_refresh_is_throttled(self):
+        self.assertTrue(self.spectator.refresh())
+        self.assertFalse(self.spectator.refresh())
+        self.now += 0.2
+        self.assertTrue(self.spectator.refresh())
+
+    def test_only_changed_cells_are_redrawn(self):
+        self.spectator.refresh(force=True)
+        self.stream.truncate(0)
+        self.stream.seek(0)
+
+        self.spectator.refresh(force=True)
+        self.assertEqual(self.stream.getvalue(), "\x1b[6;1H")
+
+        self.stream.truncate(0)
+        self.stream.seek(0)
+        self.battle.party[0].take_damage(10)
+        self.spectator.refresh(force=True)
+        output = self.stream.getvalue()
+        self.assertIn("\x1b[3;", output)
+        self.assertNotIn("Бой 1", output)
+
+    def test_events_only_mark_spectator_dirty(self):
+        with contextlib.redirect_stdout(None):
+            self.battle.play_round()
+        self.assertTrue(self.spectator.dirty)
+        self.assertEqual(self.stream.getvalue(), "")
+
+        thread, stop = self.spectator.start()
+        stop.set()
+        thread.join()
+        self.assertFalse(self.spectator.dirty)
+        self.assertIn("Раунд 1", self.stream.getvalue())
+
+
+class TestLockstep(unittest.TestCase):
+
+    def setUp(self):
+        self.roster = [('Warrior', 4), ('Mage', 4), ('Healer', 4)]
+
+    def test_clients_stay_in_sync(self):
+        clients = run_loopback(11, self.roster, 4,
+                               lambda battle, member: ACTION_SKILL if member == 1 else ACTION_ATTACK)
+        checksums = {state_checksum(client.battle) for client in clients}
+        self.assertEqual(len(checksums), 1)
+        self.assertEqual(len({client.outcome for client in clients}), 1)
+
+        rounds = clients[0].battle.round_number
+        players = len(self.roster)
+        self.assertEqual(clients[0].relay.bytes_relayed,
+                         rounds * INPUT_PACKET.size * (players + players * players))
+
+    def test_desync_is_detected(self):
+        relay = LoopbackRelay(2)
+        first = LockstepClient(relay, 0, 0, 3, self.roster, 4)
+        second = LockstepClient(relay, 1, 1, 3, self.roster, 4)
+
+        second.battle.boss.take_damage(1)
+        first.submit(ACTION_ATTACK)
+        second.submit(ACTION_ATTACK)
+        with self.assertRaises(DesyncError):
+            first.step()
+
+    def test_hidden_state_divergence_changes_checksum(self):
+        first = LockstepClient(LoopbackRelay(1), 0, 0, 3, self.roster, 4)
+        second = LockstepClient(LoopbackRelay(1), 0, 0, 3, self.roster, 4)
+        self.assertEqual(state_checksum(first.battle), state_checksum(second.battle))
+
+        for client in (first, second):
+            client.battle.boss.add_effect(PoisonEffect(5))
+        second.battle.boss.get_effects()[0].current_duration -= 1
+        self.assertNotEqual(state_checksum(first.battle), state_checksum(second.battle))
+
+        second.battle.boss.get_effects()[0].current_duration += 1
+        second.battle.party[0].skills[0].current_cooldown = 1
+        self.assertNotEqual(state_checksum(first.battle), state_checksum(second.battle))
+
+        second.battle.party[0].skills[0].current_cooldown = 0
+        second.battle.turn_order.position = 2
+        self.assertNotEqual(state_checksum(first.battle), state_checksum(second.battle))
+
+
+class TestCampaign(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.journal_path = os.path.join(self.directory.name, "journal.jsonl")
+        self.campaign = Campaign([[('Warrior', 3), ('Mage', 3)]], [2, 4], range(0, 30), unit_size=10)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_units_cover_campaign(self):
+        units = list(self.campaign.units())
+        self.assertEqual(len(units), 6)
+        self.assertEqual(sum(unit.seed_stop - unit.seed_start for unit in units), 60)
+
+    def test_stepped_seeds_are_respected(self):
+        campaign = Campaign([[('Warrior', 3)]], [2], range(0, 20, 2), unit_size=4)
+        units = list(campaign.units())
+        seeds = [seed for unit in units for seed in unit.seeds]
+        self.assertEqual(seeds, list(range(0, 20, 2)))
+        self.assertEqual(len({unit.unit_id for unit in units}), len(units))
+        self.assertEqual(run_unit(units[0])['battles'], 4)
+
+    def test_resume_skips_finished_units(self):
+        runner = CampaignRunner(self.campaign, self.journal_path, workers=2)
+        runner.run(limit=2)
+        self.assertEqual(runner.executed, 2)
+
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.write('{"unit": "обрыв')
+
+        resumed = CampaignRunner(self.campaign, self.journal_path, workers=2)
+        self.assertEqual(len(resumed.pending_units()), 4)
+        summary = resumed.run()
+        self.assertEqual(resumed.executed, 4)
+
+        expected = [run_unit(unit) for unit in self.campaign.units() if unit.boss_level == 2]
+        total = summary[("Warrior:3,Mage:3", 2)]
+        self.assertEqual(total['battles'], 30)
+        self.assertEqual(total['wins'], sum(record['wins'] for record in expected))
+
+        again = CampaignRunner(self.campaign, self.journal_path, workers=2)
+        self.assertEqual(again.run(), summary)
+        self.assertEqual(again.executed, 0)
+
+
+class TestFixedPoint(unittest.TestCase):
+
+    def setUp(self):
+        set_fixed_point(True)
+
+    def tearDown(self):
+        set_fixed_point(False)
+
+    def test_scale_rounds_half_up(self):
+        self.assertEqual(scale(28, 0.6), 17)
+        self.assertEqual(scale(25, 0.5), 13)
+        self.assertEqual(scale(30, 0.8), 24)
+        self.assertIsInstance(scale(41, 1.5), int)
+
+    def test_scale_matches_float_within_tolerance(self):
+        for value in range(1, 101):
+            for factor in (0.6, 0.7, 0.8, 1.2, 1.5, 2.0):
+                self.assertLessEqual(abs(scale(value, factor) - value * factor), 0.5 + 1e-9)
+
+    def test_battle_keeps_integer_stats(self):
+        battle, _ = run_battle([('Warrior', 5), ('Mage', 5), ('Healer', 5)], 5, 3)
+        for char in battle.party + [battle.boss]:
+            self.assertIsInstance(char.hp, int)
+            self.assertIsInstance(char.mp, int)
+
+    def test_stat_modifiers_stay_integral(self):
+        healer = Healer("Лекарь", 1)
+        healer.add_effect(BuffEffect('intellect', add=2.5))
+        self.assertEqual(healer.intellect, 25)
+        self.assertIsInstance(healer.intellect, int)
+
+        warrior = Warrior("Воин", 1)
+        warrior.take_damage(60)
+        healer.use_skill(warrior)
+        self.assertIsInstance(warrior.hp, int)
+
+    def test_spawned_workers_inherit_mode(self):
+        with worker_pool(1, multiprocessing.get_context('spawn')) as pool:
+            self.assertTrue(pool.apply(is_fixed_point))
+
+
+class TestInvariants(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.roster = [('Warrior', 3), ('Mage', 3), ('Healer', 3)]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_sampled_runs_are_clean(self):
+        checker = InvariantChecker(battle_rate=0.5, turn_rate=0.5, seed=1)
+        for seed in range(20):
+            run_battle(self.roster, 3, seed, checker=checker)
+        self.assertEqual(checker.violations, [])
+
+    def test_violation_dumps_reproducer(self):
+        checker = InvariantChecker(dump_dir=self.directory.name)
+        battle, _ = run_battle(self.roster, 3, 5, checker=checker)
+
+        warrior = battle.party[0]
+        warrior._hp = 0
+        with self.assertRaises(InvariantViolation):
+            battle._execute_single_turn(warrior)
+
+        files = os.listdir(self.directory.name)
+        self.assertEqual(len(files), 1)
+        with open(os.path.join(self.directory.name, files[0]), encoding='utf-8') as f:
+            reproducer = json.load(f)
+        self.assertEqual(reproducer['seed'], 5)
+        self.assertEqual(reproducer['roster'], [list(member) for member in self.roster])
+        self.assertIn("получил ход", reproducer['violation'])
+
+    def ungated_battle(self, checker: InvariantChecker) -> Battle:
+        class UngatedStrike(PowerStrikeSkill):
+            def can_use(self, caster, target):
+                return True
+
+        warrior = Warrior("Воин", 1)
+        warrior.skills[0] = UngatedStrike()
+        battle = Battle([warrior], Boss("Босс", 1))
+        battle._choose_action = lambda character: ACTION_SKILL
+        checker.attach(battle, seed=9)
+        return battle
+
+    def test_skill_on_cooldown_is_reported(self):
+        checker = InvariantChecker(raise_on_violation=False)
+        battle = self.ungated_battle(checker)
+        warrior = battle.party[0]
+        warrior.skills[0].current_cooldown = 2
+
+        with contextlib.redirect_stdout(None):
+            battle._execute_single_turn(warrior)
+        self.assertEqual(len(checker.violations), 1)
+        self.assertIn("перезарядке", checker.violations[0]['violation'])
+        self.assertEqual(checker.violations[0]['seed'], 9)
+
+    def test_skill_without_mp_is_reported(self):
+        checker = InvariantChecker()
+        battle = self.ungated_battle(checker)
+        warrior = battle.party[0]
+        warrior.mp = 5
+
+        with contextlib.redirect_stdout(None), self.assertRaises(InvariantViolation):
+            battle._execute_single_turn(warrior)
+        self.assertEqual(warrior.mp, 5)
+
+    def test_gated_skill_use_is_not_reported(self):
+        warrior = Warrior("Воин", 1)
+        warrior.skills[0].current_cooldown = 2
+        battle = Battle([warrior], Boss("Босс", 1))
+        battle._choose_action = lambda character: ACTION_SKILL
+
+        checker = InvariantChecker(raise_on_violation=False)
+        checker.attach(battle)
+        with contextlib.redirect_stdout(None):
+            battle._execute_single_turn(warrior)
+        self.assertEqual(checker.violations, [])
+
+
+class TestPooling(unittest.TestCase):
+
+    def setUp(self):
+        POOLS.clear()
+        self.roster = [('Warrior', 4), ('Mage', 4), ('Healer', 4)]
+
+    def tearDown(self):
+        POOLS.clear()
+
+    def test_object_pool_resets_on_acquire(self):
+        pool = ObjectPool(PoisonEffect)
+        poison = pool.acquire(5)
+        poison.current_duration = 0
+        pool.release(poison)
+
+        reused = pool.acquire(10)
+        self.assertIs(reused, poison)
+        self.assertEqual(reused.damage_per_turn, 10)
+        self.assertEqual(reused.current_duration, reused.duration)
+        self.assertEqual((pool.created, pool.reused), (1, 1))
+
+    def test_release_ignores_foreign_and_repeated_objects(self):
+        pool = ObjectPool(PoisonEffect)
+        pool.release(PoisonEffect(5))
+        self.assertEqual(pool.free_count, 0)
+
+        poison = pool.acquire(5)
+        pool.release(poison)
+        pool.release(poison)
+        self.assertEqual(pool.free_count, 1)
+
+        battle, _ = run_battle(self.roster, 4, 3)
+        release_battle(battle)
+        release_battle(battle)
+        self.assertEqual(POOLS.pool(Boss).free_count, 1)
+        self.assertIsNot(POOLS.acquire(Warrior, "Воин", 4), POOLS.acquire(Warrior, "Воин", 4))
+
+    def test_disabled_registry_does_not_pool(self):
+        POOLS.enabled = False
+        try:
+            poison = POOLS.acquire(PoisonEffect, 5)
+            POOLS.release(poison)
+            self.assertIsNot(POOLS.acquire(PoisonEffect, 5), poison)
+            self.assertEqual(POOLS.pool(PoisonEffect).free_count, 0)
+        finally:
+            POOLS.enabled = True
+
+    def test_pooled_battles_match_fresh_battles(self):
+        fresh, fresh_victory = run_battle(self.roster, 4, 21)
+        fresh_log = fresh.get_battle_log()
+
+        release_battle(run_battle(self.roster, 6, 8)[0])
+        reused = POOLS.pool(Boss).reused
+        pooled, pooled_victory = run_battle(self.roster, 4, 21)
+
+        self.assertEqual(POOLS.pool(Boss).reused, reused + 1)
+        self.assertEqual(pooled_victory, fresh_victory)
+        self.assertEqual(pooled.get_battle_log(), fresh_log)
+
+    def test_reset_restores_character(self):
+        mage = Mage("Маг", 3)
+        mage.take_damage(40)
+        mage.add_effect(POOLS.acquire(ShieldEffect, 10))
+        mage.skills[0].current_cooldown = 2
+
+        mage.reset("Новый маг", 2)
+        fresh = Mage("Новый маг", 2)
+        self.assertEqual(mage.name, fresh.name)
+        self.assertEqual((mage.hp, mage.max_hp, mage.intellect), (fresh.hp, fresh.max_hp, fresh.intellect))
+        self.assertEqual(mage.active_effects, [])
+        self.assertEqual(mage.skills[0].current_cooldown, 0)
+        self.assertEqual(POOLS.pool(ShieldEffect).free_count, 1)
+
+        scripted = POOLS.acquire(Boss, "Скриптовый босс", 1, phases=[
+            {'name': 'p1', 'strategy': 'aggressive', 'hp_above': 0.5},
+            {'name': 'last', 'strategy': 'aoe', 'hp_above': 0.0}
+        ])
+        POOLS.release(scripted)
+        boss = POOLS.acquire(Boss, "Босс", level=3)
+        self.assertIs(boss, scripted)
+        self.assertEqual(boss.phase, "phase1")
+        self.assertEqual([phase.name for phase in boss._phases], ["phase1", "phase2", "phase3"])
+
+
+class TestMatchmaking(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.surrogate = Surrogate.build(4, levels=[1, 2], boss_levels=[1, 6], workers=2)
+
+    def test_table_covers_grid(self):
+        self.assertEqual(len(self.surrogate._cells), len(compositions()) * 2 * 2)
+
+    def test_predict_is_fast(self):
+        party = [Warrior("Воин", 2), Mage("Маг", 2), Healer("Лекарь", 1)]
+        calls = 1000
+        started = time.perf_counter()
+        for _ in range(calls):
+            win_rate, rounds = self.surrogate.predict(party, 6)
+        self.assertLess((time.perf_counter() - started) / calls, 0.001)
+        self.assertTrue(0.0 <= win_rate <= 1.0)
+        self.assertGreater(rounds, 0)
+
+    def test_recommend_and_round_trip(self):
+        party = [Warrior("Воин", 9), Warrior("Воин", 9), Healer("Лекарь", 9)]
+        level = self.surrogate.recommend_boss_level(party, target_win_rate=1.0)
+        self.assertEqual(level, 1)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "surrogate.json")
+            self.surrogate.save(path)
+            loaded = Surrogate.load(path)
+        self.assertEqual(loaded.predict(party, 6), self.surrogate.predict(party, 6))
+
+
+class TestAutosave(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "autosave.journal")
+        random.seed(17)
+        self.battle = Battle([Warrior("Воин", 4), Mage("Маг", 4), Healer("Лекарь", 4)], Boss("Босс", 5))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def play_rounds(self, rounds: int):
+        with contextlib.redirect_stdout(None):
+            for _ in range(rounds):
+                if self.battle.is_finished:
+                    break
+                self.battle.play_round()
+
+    def test_restores_in_progress_battle(self):
+        journal = AutosaveJournal(self.path, compact_every=3)
+        journal.attach(self.battle)
+        self.play_rounds(5)
+        journal.close()
+
+        restored = AutosaveJournal.load(self.path)
+        self.assertEqual(battle_state(restored), battle_state(self.battle))
+        self.assertEqual(restored.boss.phase, self.battle.boss.phase)
+        self.assertEqual(restored.party[1].active_effects, self.battle.party[1].active_effects)
+
+    def test_restores_stat_buffs(self):
+        journal = AutosaveJournal(self.path)
+        self.battle.party[0].add_effect(BuffEffect('strength', add=7, duration=5))
+        journal.attach(self.battle)
+        journal.close()
+
+        restored = AutosaveJournal.load(self.path)
+        self.assertEqual(restored.party[0].strength, self.battle.party[0].strength)
+        self.assertEqual(restored.party[0].active_effects, ["Усиление"])
+
+    def test_journal_appends_deltas_and_compacts(self):
+        journal = AutosaveJournal(self.path, compact_every=100, strict=True)
+        journal.attach(self.battle)
+        self.play_rounds(3)
+
+        with open(self.path, encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(records[0]['kind'], 'full')
+        self.assertTrue(all(record['kind'] == 'delta' for record in records[1:]))
+        self.assertNotIn('roster', records[1])
+
+        journal.compact(self.battle)
+        with open(self.path, encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 1)
+        journal.close(remove=True)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_restores_scripted_boss(self):
+        self.battle = Battle([Warrior("Воин", 4)], Boss("Скриптовый босс", 1, phases=[
+            {'name': 'calm', 'strategy': 'aggressive', 'hp_above': 0.5},
+            {'name': 'guard', 'strategy': 'debuff', 'hp_above': 0.0,
+             'on_enter': [('shield', 40)]}
+        ]))
+        self.battle.boss.take_damage(self.battle.boss.max_hp * 0.6)
+        journal = AutosaveJournal(self.path)
+        journal.attach(self.battle)
+        journal.close()
+
+        restored = AutosaveJournal.load(self.path)
+        self.assertEqual(restored.boss.phase, "guard")
+        self.assertEqual(battle_state(restored), battle_state(self.battle))
+
+    def test_delta_contains_only_changed_fields(self):
+        journal = AutosaveJournal(self.path, strict=True)
+        journal.attach(self.battle)
+        journal.record_round(self.battle)
+        self.battle.boss.add_effect(ShieldEffect(10))
+        self.battle.party[1].take_damage(5)
+        journal.record_round(self.battle)
+        journal.close()
+
+        with open(self.path, encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(records[1], {'kind': 'delta', 'round': 0})
+        self.assertEqual(set(records[2]['units']), {'1', '3'})
+        self.assertEqual(set(records[2]['units']['1']), {'hp', 'damage_taken'})
+        self.assertEqual(set(records[2]['units']['3']), {'effects'})
+        self.assertFalse(self.battle.boss.dirty_fields)
+
+    def read_records(self) -> list:
+        with open(self.path, encoding='utf-8') as f:
+            return [json.loads(line) for line in f]
+
+    def test_effect_ticks_record_only_changed_state(self):
+        journal = AutosaveJournal(self.path, strict=True)
+        journal.attach(self.battle)
+        boss = self.battle.boss
+        boss.add_effect(PoisonEffect(5))
+        boss.add_effect(ShieldEffect(30))
+        journal.record_round(self.battle)
+
+        boss.process_effects()
+        boss.take_damage(10)
+        journal.record_round(self.battle)
+        journal.close()
+
+        changes = self.read_records()[2]['units']['3']
+        self.assertNotIn('effects', changes)
+        self.assertEqual(changes['effect_state'], {'0': {'current_duration': 2},
+                                                   '1': {'current_duration': 1, 'remaining_shield': 15}})
+        restored = AutosaveJournal.load(self.path)
+        self.assertEqual(battle_state(restored), battle_state(self.battle))
+
+    def test_checkpoints_are_batched_unless_strict(self):
+        journal = AutosaveJournal(self.path, flush_rounds=3, flush_interval=60.0)
+        journal.attach(self.battle)
+        self.play_rounds(2)
+        self.assertEqual(len(self.read_records()), 1)
+
+        self.play_rounds(1)
+        records = self.read_records()
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[1]['round'], 3)
+
+        self.play_rounds(1)
+        journal.close()
+        self.assertEqual(self.read_records()[-1]['round'], 4)
+        self.assertEqual(battle_state(AutosaveJournal.load(self.path)), battle_state(self.battle))
+
+        strict = AutosaveJournal(self.path, strict=True)
+        strict.attach(self.battle)
+        self.play_rounds(1)
+        self.assertEqual(len(self.read_records()), 2)
+        strict.close()
+
+    def test_measure_overhead_reports_ratio(self):
+        report = measure_overhead(2)
+        self.assertGreater(report['rounds'], 0)
+        self.assertAlmostEqual(report['ratio'], report['journal_us'] / report['round_us'])
+
+    def test_torn_write_is_ignored(self):
+        journal = AutosaveJournal(self.path)
+        journal.attach(self.battle)
+        self.play_rounds(2)
+        expected = battle_state(self.battle)
+        journal.close()
+
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write('{"kind": "delta", "rou')
+        self.assertEqual(battle_state(AutosaveJournal.load(self.path)), expected)
+
+
+class TestBroadcast(unittest.TestCase):
+
+    def test_frame_is_encoded_once_for_all_subscribers(self):
+        async def scenario():
+            broadcaster = Broadcaster()
+            first = broadcaster.subscribe()
+            second = broadcaster.subscribe()
+            broadcaster.publish({'type': 'event', 'message': 'удар'})
+            broadcaster.publish({'type': 'event', 'message': 'лечение'})
+            frame = broadcaster.flush()
+            self.assertIsNone(broadcaster.flush())
+            return frame, await first.get(), await second.get()
+
+        frame, first, second = asyncio.run(scenario())
+        self.assertIs(first, frame)
+        self.assertIs(second, frame)
+        self.assertEqual(len(json.loads(frame)), 2)
+
+    def test_slow_subscribers_are_bounded(self):
+        async def scenario():
+            broadcaster = Broadcaster()
+            dropping = broadcaster.subscribe(maxsize=2)
+            latest = broadcaster.subscribe(maxsize=2, policy=POLICY_LATEST)
+            for i in range(5):
+                broadcaster.publish({'type': 'event', 'index': i})
+                broadcaster.flush()
+            return dropping, latest
+
+        dropping, latest = asyncio.run(scenario())
+        self.assertEqual((dropping.pending, dropping.dropped), (2, 3))
+        self.assertEqual(latest.pending, 1)
+        self.assertEqual(latest.dropped, 4)
+
+    def test_load_test_delivers_battle(self):
+        random.seed(4)
+        battle = Battle([Warrior("Воин", 5), Mage("Маг", 5)], Boss("Босс", 2))
+        report = asyncio.run(run_load_test(battle, subscribers=50, slow_fraction=0.2,
+                                           slow_delay=0.01, tick=0.005, round_delay=0.001))
+
+        fast = report['clients'][-1]
+        slow = report['clients'][0]
+        self.assertEqual(fast.frames, report['frames_sent'])
+        self.assertEqual(fast.last_status['round'], battle.round_number)
+        self.assertEqual(slow.last_status['round'], battle.round_number)
+
+
+class TestStatModifiers(unittest.TestCase):
+
+    def setUp(self):
+        self.warrior = Warrior("Воин", 1)
+        self.base_strength = self.warrior.strength
+
+    def test_modifiers_combine_additive_then_multiplicative(self):
+        self.warrior.add_stat_modifier(StatModifier('strength', add=4))
+        self.warrior.add_stat_modifier(StatModifier('strength', mult=2.0))
+        self.assertEqual(self.warrior.strength, (self.base_strength + 4) * 2)
+
+    def test_effective_stat_is_cached_until_modifier_changes(self):
+        modifier = StatModifier('strength', add=3)
+        self.warrior.add_stat_modifier(modifier)
+        self.assertEqual(self.warrior.strength, self.base_strength + 3)
+
+        with self.assertRaises(AttributeError):
+            modifier.add = 100
+        self.assertEqual(self.warrior._effective_stats['strength'], self.base_strength + 3)
+
+        self.warrior.remove_stat_modifier(modifier)
+        self.assertEqual(self.warrior.strength, self.base_strength)
+
+        self.warrior.strength = 40
+        self.assertEqual(self.warrior.strength, 40)
+
+    def test_buff_effect_expires(self):
+        self.warrior.add_effect(BuffEffect('strength', add=10, duration=1))
+        self.assertEqual(self.warrior.strength, self.base_strength + 10)
+        self.warrior.process_effects()
+        self.assertEqual(self.warrior.strength, self.base_strength)
+
+    def test_buff_potion_and_turn_order(self):
+        boss = Boss("Босс", 1)
+        order = TurnOrder([self.warrior, boss])
+        self.assertIs(next(order), boss)
+
+        self.warrior.inventory = Inventory()
+        self.warrior.inventory.add_item(BuffPotion('agility', add=50))
+        self.warrior.inventory.use_item(0, self.warrior)
+        self.assertIn("Усиление", self.warrior.active_effects)
+
+        next(order)
+        self.assertIs(next(order), self.warrior)
+
+    def test_debuff_is_clamped(self):
+        self.warrior.add_stat_modifier(StatModifier('agility', add=-500))
+        self.assertEqual(self.warrior.agility, 1)
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file